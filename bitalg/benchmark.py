@@ -0,0 +1,122 @@
+import copy
+import multiprocessing
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter, process_time
+
+import numpy as np
+import pandas as pd
+
+_ALGORITHMS = {}
+_GENERATORS = {}
+
+
+def _init_worker(algorithms, generators):
+    # with fork the dictionaries are inherited, so notebook functions and lambdas work without pickling
+    _ALGORITHMS.clear()
+    _ALGORITHMS.update(algorithms)
+    _GENERATORS.clear()
+    _GENERATORS.update(generators)
+
+
+def measure(algorithm, data, repeat=5, warmup=1, memory=False):
+    """
+    Times algorithm(data) repeat times after warmup untimed runs. Every run gets a
+    fresh shallow copy of data, so algorithms that sort their input in place are fair.
+    :param memory: additionally run the algorithm once under tracemalloc to get its peak memory
+    :return: dictionary with the median and interquartile range of the wall-clock and CPU times
+             in seconds and the peak memory in bytes (None if memory is False)
+    """
+    for _ in range(warmup):
+        algorithm(copy.copy(data))
+
+    wall, cpu = [], []
+    for _ in range(repeat):
+        run_data = copy.copy(data)
+        wall_start, cpu_start = perf_counter(), process_time()
+        algorithm(run_data)
+        cpu.append(process_time() - cpu_start)
+        wall.append(perf_counter() - wall_start)
+
+    peak_memory = None
+    if memory:
+        run_data = copy.copy(data)
+        tracemalloc.start()
+        try:
+            algorithm(run_data)
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    wall_q1, wall_median, wall_q3 = np.percentile(wall, [25, 50, 75])
+    cpu_q1, cpu_median, cpu_q3 = np.percentile(cpu, [25, 50, 75])
+
+    return {
+        "wall_median": wall_median, "wall_iqr": wall_q3 - wall_q1,
+        "cpu_median": cpu_median, "cpu_iqr": cpu_q3 - cpu_q1,
+        "peak_memory": peak_memory,
+    }
+
+
+def _run_size(size, seed, repeat, warmup, memory):
+    rows = []
+    for generator_no, (dataset, generator) in enumerate(_GENERATORS.items()):
+        rng = np.random.default_rng(np.random.SeedSequence([seed, generator_no, size]))
+        data = generator(size, rng)
+
+        for name, algorithm in _ALGORITHMS.items():
+            row = {"algorithm": name, "dataset": dataset, "size": size, "repeat": repeat}
+            row.update(measure(algorithm, data, repeat, warmup, memory))
+            rows.append(row)
+
+    return rows
+
+
+def run_benchmark(algorithms, generators, sizes, repeat=5, warmup=1, seed=0, memory=False, workers=1):
+    """
+    Benchmarks every algorithm on data from every generator for every size.
+    The data for a (generator, size) pair depends only on seed, so runs are repeatable
+    and every algorithm gets exactly the same input.
+    :param algorithms: dictionary {name: function taking the generated data}
+    :param generators: dictionary {dataset name: function (n, rng) -> data}, rng being a numpy Generator
+    :param sizes: iterable of input sizes
+    :param repeat: number of timed runs
+    :param warmup: number of untimed runs before them
+    :param seed: base seed; generators must draw from the rng they get for the runs to be repeatable
+    :param memory: measure peak memory with tracemalloc (in an extra, untimed run)
+    :param workers: number of processes the sizes are spread over; note that
+                    parallel runs compete for the CPU, so use 1 for the most stable timings
+    :return: DataFrame with one row per (algorithm, dataset, size)
+    """
+    sizes = list(sizes)
+    jobs = [(size, seed, repeat, warmup, memory) for size in sizes]
+
+    if workers == 1:
+        _init_worker(algorithms, generators)
+        results = [_run_size(*job) for job in jobs]
+    else:
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=_init_worker, initargs=(algorithms, generators)) as executor:
+            results = list(executor.map(_run_size, *zip(*jobs)))
+
+    columns = ["algorithm", "dataset", "size", "repeat",
+               "wall_median", "wall_iqr", "cpu_median", "cpu_iqr", "peak_memory"]
+    return pd.DataFrame([row for rows in results for row in rows], columns=columns)
+
+
+def save_results(results, path):
+    """
+    Saves benchmark results as JSON (if path ends with .json) or CSV
+    """
+    if str(path).endswith(".json"):
+        results.to_json(path, orient="records", indent=2)
+    else:
+        results.to_csv(path, index=False)
+
+
+def load_results(path):
+    if str(path).endswith(".json"):
+        return pd.read_json(path, orient="records")
+    return pd.read_csv(path)
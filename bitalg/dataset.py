@@ -0,0 +1,75 @@
+from os import path, listdir
+import numpy as np
+from bitalg import __path__ as pkg_path
+
+# datasets are plain .npy files: a small header with the dtype and shape followed by raw float64 values,
+# so np.memmap can map them without reading anything but the header
+
+
+def save_dataset(file_name, data):
+    """
+    Saves points [(x1, y1), ...], segments [((x1, y1), (x2, y2)), ...] or any array as float64 .npy
+    :return: path of the saved file
+    """
+    if not file_name.endswith(".npy"):
+        file_name += ".npy"
+    np.save(file_name, np.ascontiguousarray(data, dtype=np.float64))
+    return file_name
+
+
+def load_dataset(file_name, mmap=True):
+    """
+    Opens a dataset saved with save_dataset. With mmap it is memory-mapped read-only,
+    which takes constant time regardless of its size; worker processes sharing a dataset
+    should get the file name and open it themselves, as pickling a memmap copies its data.
+    :return: array of shape (n, 2) for points or (n, 2, 2) for segments
+    """
+    return np.load(file_name, mmap_mode="r" if mmap else None)
+
+
+def read_fixture(file_name):
+    """
+    Parses a text fixture of whitespace separated numbers with np.loadtxt
+    :return: float array of shape (lines, numbers in a line), (0, 0) for an empty file
+    """
+    if path.getsize(file_name) == 0:
+        return np.empty((0, 0))
+    return np.loadtxt(file_name, dtype=float, ndmin=2)
+
+
+def convert_fixture(file_name, out_name=None):
+    """
+    Converts a text fixture (e.g. test_2_1_1.in) into a dataset (test_2_1_1.in.npy by default),
+    reshaped to (n, 2, 2) for 4 numbers in a line (segments) and to (n,) for a single number
+    :return: path of the saved dataset
+    """
+    data = read_fixture(file_name)
+    if data.shape[1] == 4:
+        data = data.reshape(-1, 2, 2)
+    elif data.shape[1] == 1:
+        data = data.ravel()
+    return save_dataset(out_name or file_name + ".npy", data)
+
+
+def convert_fixtures(lab_no):
+    """
+    Converts every numeric .in / .out fixture of a lab into a dataset next to it,
+    skipping the files which are not tables of numbers
+    :return: paths of the saved datasets
+    """
+    converted = []
+    lab_dir = path.join(pkg_path[0], f"tests/test{lab_no}_tests")
+
+    for task_dir in sorted(listdir(lab_dir)):
+        if not task_dir.startswith("task"):
+            continue
+
+        for file_name in sorted(listdir(path.join(lab_dir, task_dir))):
+            if not file_name.endswith((".in", ".out")):
+                continue
+            try:
+                converted.append(convert_fixture(path.join(lab_dir, task_dir, file_name)))
+            except ValueError:
+                pass
+
+    return converted
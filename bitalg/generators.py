@@ -0,0 +1,199 @@
+import numpy as np
+
+
+def to_tuples(values):
+    """
+    Converts generated points of shape (n, 2) into [(x1, y1), ...]
+    and segments of shape (n, 2, 2) into [((x1, y1), (x2, y2)), ...]
+    """
+    values = np.asarray(values)
+    if values.ndim == 3:
+        return [(tuple(beg), tuple(end)) for beg, end in values.tolist()]
+    return [tuple(p) for p in values.tolist()]
+
+
+def unique(draw, n):
+    """
+    Draws n values and redraws the repeated ones until all of them are distinct
+    :param draw: function k -> array of k numbers or of k points of shape (k, 2)
+    :param n: number of values
+    :return: array of n distinct values
+    """
+    values = draw(n)
+    while True:
+        keys = values
+        if values.ndim == 2:
+            # a contiguous (n, 2) float array viewed as complex numbers sorts like (x, y) pairs, much faster than axis=0
+            keys = np.ascontiguousarray(values, dtype=np.float64).view(np.complex128).ravel()
+
+        _, first = np.unique(keys, return_index=True)
+        if len(first) == n:
+            return values
+
+        repeated = np.ones(n, dtype=bool)
+        repeated[first] = False
+        values[repeated] = draw(np.count_nonzero(repeated))
+
+
+def points_on_segments(starts, ends, lengths):
+    """
+    Maps positions along the polyline made of the segments starts[i] -> ends[i] onto points
+    :param starts: segment beginnings of shape (k, 2)
+    :param ends: segment ends of shape (k, 2)
+    :param lengths: positions measured along the segments, from 0 to their total length
+    :return: array of points of shape (n, 2)
+    """
+    starts, ends = np.asarray(starts, dtype=float), np.asarray(ends, dtype=float)
+    vectors = ends - starts
+    sides = np.hypot(vectors[:, 0], vectors[:, 1])
+    offsets = np.r_[0, np.cumsum(sides)]
+
+    side = np.clip(np.searchsorted(offsets, lengths, side='right') - 1, 0, len(sides) - 1)
+
+    return starts[side] + vectors[side] * ((lengths - offsets[side]) / sides[side])[:, None]
+
+
+def uniform_points(n, low=-100, high=100, rng=None):
+    """
+    n distinct points drawn uniformly from the square [low, high] x [low, high]
+    :param rng: numpy Generator or seed
+    :return: array of shape (n, 2)
+    """
+    rng = np.random.default_rng(rng)
+    return unique(lambda k: rng.uniform(low, high, (k, 2)), n)
+
+
+def circle_points(n, center=(0, 0), radius=10, rng=None):
+    """
+    n distinct points drawn uniformly from the circle with the given center and radius
+    :return: array of shape (n, 2)
+    """
+    rng = np.random.default_rng(rng)
+    theta = unique(lambda k: rng.uniform(0, 2 * np.pi, k), n)
+    return np.stack((center[0] + radius * np.cos(theta), center[1] + radius * np.sin(theta)), axis=1)
+
+
+def rectangle_points(n, a=(-10, -10), b=(10, -10), c=(10, 10), d=(-10, 10), rng=None):
+    """
+    n distinct points drawn uniformly from the perimeter of the rectangle abcd
+    :return: array of shape (n, 2)
+    """
+    rng = np.random.default_rng(rng)
+    starts, ends = [a, b, c, d], [b, c, d, a]
+    perimeter = 2 * (np.hypot(b[0] - a[0], b[1] - a[1]) + np.hypot(c[0] - b[0], c[1] - b[1]))
+
+    lengths = unique(lambda k: rng.uniform(0, perimeter, k), n)
+    return points_on_segments(starts, ends, lengths)
+
+
+def rectangle_two_sides_points(n, a=(-10, -10), b=(10, -10), c=(10, 10), d=(-10, 10), rng=None):
+    """
+    n distinct points drawn uniformly from the sides ab and da of the rectangle abcd
+    :return: array of shape (n, 2)
+    """
+    rng = np.random.default_rng(rng)
+    starts, ends = [a, d], [b, a]
+    total = np.hypot(b[0] - a[0], b[1] - a[1]) + np.hypot(a[0] - d[0], a[1] - d[1])
+
+    lengths = unique(lambda k: rng.uniform(0, total, k), n)
+    return points_on_segments(starts, ends, lengths)
+
+
+def square_points(axis_n=25, diag_n=20, a=(0, 0), b=(10, 0), c=(10, 10), d=(0, 10), rng=None):
+    """
+    axis_n points on the sides ab and da of the square abcd, diag_n points on each
+    of its diagonals and the vertices themselves, in this order
+    :return: array of shape (axis_n + 2 * diag_n + 4, 2)
+    """
+    rng = np.random.default_rng(rng)
+    axis_points = rectangle_two_sides_points(axis_n, a, b, c, d, rng)
+
+    diagonal = np.hypot(c[0] - a[0], c[1] - a[1])
+    diag_1 = points_on_segments([a], [c], unique(lambda k: rng.uniform(0, diagonal, k), diag_n))
+    diag_2 = points_on_segments([b], [d], unique(lambda k: rng.uniform(0, diagonal, k), diag_n))
+
+    return np.concatenate((axis_points, diag_1, diag_2, np.array([a, b, c, d], dtype=float)))
+
+
+def gaussian_points(n, mean=(0, 0), std=10, rng=None):
+    """
+    n distinct points from a normal distribution, std being a number or (std_x, std_y)
+    :return: array of shape (n, 2)
+    """
+    rng = np.random.default_rng(rng)
+    return unique(lambda k: rng.normal(mean, std, (k, 2)), n)
+
+
+def clustered_points(n, clusters=10, spread=5, low=-100, high=100, rng=None):
+    """
+    n distinct points in normally distributed clusters around centers drawn uniformly
+    from the square [low, high] x [low, high]
+    :param clusters: number of clusters
+    :param spread: standard deviation of a cluster
+    :return: array of shape (n, 2)
+    """
+    rng = np.random.default_rng(rng)
+    centers = rng.uniform(low, high, (clusters, 2))
+
+    def draw(k):
+        return centers[rng.integers(0, clusters, k)] + rng.normal(0, spread, (k, 2))
+
+    return unique(draw, n)
+
+
+def lattice_points(n, size=100, rng=None):
+    """
+    Adversarial input for orientation tests and hulls: n distinct points with integer coordinates
+    from [0, size) x [0, size), so that many triples are exactly collinear
+    :return: array of shape (n, 2)
+    """
+    if n > size * size:
+        raise ValueError(f'Available lattice has only {size * size} points.')
+
+    rng = np.random.default_rng(rng)
+    cells = rng.choice(size * size, n, replace=False)
+    return np.stack((cells // size, cells % size), axis=1).astype(float)
+
+
+def uniform_sections(n, max_x=200, max_y=200, rng=None):
+    """
+    n segments with endpoints drawn uniformly from [0, max_x] x [0, max_y].
+    All 2n x coordinates are distinct, and so are all 2n y coordinates,
+    so there are no vertical or horizontal segments and no shared endpoints.
+    :return: array of shape (n, 2, 2), segment i going from [i, 0] to [i, 1]
+    """
+    rng = np.random.default_rng(rng)
+    x = unique(lambda k: rng.uniform(0, max_x, k), 2 * n)
+    y = unique(lambda k: rng.uniform(0, max_y, k), 2 * n)
+
+    return np.stack((x.reshape(n, 2), y.reshape(n, 2)), axis=-1)
+
+
+def crossing_sections(n, size=200, rng=None):
+    """
+    Adversarial input for intersection algorithms: n // 2 almost horizontal segments
+    crossing the whole square [0, size] x [0, size] and n - n // 2 almost vertical ones,
+    every horizontal one intersecting every vertical one, so there are at least
+    (n // 2) * (n - n // 2) intersections.
+    Coordinates are distinct like in uniform_sections.
+    :return: array of shape (n, 2, 2)
+    """
+    rng = np.random.default_rng(rng)
+    margin = size / 20
+    horizontal, vertical = n // 2, n - n // 2
+
+    def across(k):
+        # both ends near the two opposite sides, the other coordinate away from them
+        ends = np.stack((unique(lambda m: rng.uniform(0, margin, m), k),
+                         unique(lambda m: rng.uniform(size - margin, size, m), k)), axis=1)
+        inner = unique(lambda m: rng.uniform(margin, size - margin, m), 2 * k).reshape(k, 2)
+        return ends, inner
+
+    x, y = across(horizontal)
+    horizontal_sections = np.stack((x, y), axis=-1)
+
+    y, x = across(vertical)
+    vertical_sections = np.stack((x, y), axis=-1)
+
+    sections = np.concatenate((horizontal_sections, vertical_sections))
+    return sections[rng.permutation(n)]
@@ -0,0 +1,71 @@
+import numpy as np
+
+
+def mat_det_batch(points, a, b, mat_fun="3x3"):
+    """
+    Determinants for all points at once, with the same formulas (and order of
+    operations) as the notebook's mat_det_3x3, mat_det_2x2, mat_det_3x3_lib
+    and mat_det_2x2_lib, including the precision each of them ends up in for
+    float32 input.
+    :param points: array of points of shape (n, 2)
+    :param a: first point (x, y) of the line
+    :param b: second point (x, y) of the line
+    :param mat_fun: "3x3", "2x2", "3x3_lib" or "2x2_lib"
+    :return: array of n determinants
+    """
+    points = np.asarray(points)
+    if points.dtype.kind != 'f':
+        points = points.astype(float)
+
+    a_x, a_y = a
+    b_x, b_y = b
+    c_x, c_y = points[:, 0], points[:, 1]
+
+    if mat_fun == "3x3":
+        return a_x * b_y + a_y * c_x + b_x * c_y - c_x * b_y - c_y * a_x - b_x * a_y
+    if mat_fun == "2x2":
+        return (a_x - c_x) * (b_y - c_y) - (a_y - c_y) * (b_x - c_x)
+
+    n = len(points)
+    if mat_fun == "3x3_lib":
+        # np.array([[a_x, a_y, 1], ...]) in mat_det_3x3_lib mixes Python floats in, which makes it float64
+        matrices = np.empty((n, 3, 3), dtype=np.result_type(points.dtype, float))
+        matrices[:, 0] = (a_x, a_y, 1)
+        matrices[:, 1] = (b_x, b_y, 1)
+        matrices[:, 2, :2] = points
+        matrices[:, 2, 2] = 1
+        return np.linalg.det(matrices)
+    if mat_fun == "2x2_lib":
+        matrices = np.empty((n, 2, 2), dtype=points.dtype)
+        matrices[:, 0, 0] = a_x - c_x
+        matrices[:, 0, 1] = a_y - c_y
+        matrices[:, 1, 0] = b_x - c_x
+        matrices[:, 1, 1] = b_y - c_y
+        return np.linalg.det(matrices)
+
+    raise ValueError('Available mat_fun values are "3x3", "2x2", "3x3_lib" or "2x2_lib".')
+
+
+def categorize_points_batch(points, a, b, mat_fun="3x3", eps=0):
+    """
+    Batched categorize_points: classifies every point against the line ab for
+    one or many epsilons, computing the determinants only once.
+    :param points: array of points of shape (n, 2)
+    :param a: first point (x, y) of the line
+    :param b: second point (x, y) of the line
+    :param mat_fun: "3x3", "2x2", "3x3_lib" or "2x2_lib"
+    :param eps: epsilon or a sequence of k epsilons
+    :return: boolean masks (left, center, right), each of shape (n,) for a single
+             epsilon or (k, n) for a sequence, e.g. points[left[i]] are the points
+             to the left of the line for eps[i]
+    """
+    det = mat_det_batch(points, a, b, mat_fun)
+    eps = np.asarray(eps, dtype=det.dtype)
+
+    thresholds = eps[..., None] if eps.ndim else eps
+
+    left = det > thresholds
+    right = det < -thresholds
+    center = ~(left | right)
+
+    return left, center, right
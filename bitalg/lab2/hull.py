@@ -0,0 +1,284 @@
+import numpy as np
+from bitalg.predicates import orient, orient_batch
+
+# cosines in jarvis_next are computed with an error of a few units in the last place, well below this
+COSINE_TOLERANCE = 1e-12
+
+
+def as_points(Q):
+    """
+    Converts a list of points [(x1, y1), ...] or an array into a float array of shape (n, 2)
+    """
+    return np.asarray(Q, dtype=float).reshape(-1, 2)
+
+
+def to_tuples(points):
+    return [tuple(p) for p in points.tolist()]
+
+
+def akl_toussaint_filter(points):
+    """
+    Drops the points lying strictly inside the polygon spanned by the extreme
+    points in the x, y, x + y and x - y directions. Such points can never be
+    hull vertices, and for uniform data they are the vast majority.
+    :param points: array of shape (n, 2)
+    :return: array of the remaining points (hull vertices are never removed)
+    """
+    if len(points) < 8:
+        return points
+
+    x, y = points[:, 0], points[:, 1]
+    # counter-clockwise: bottom, bottom-right, right, top-right, top, top-left, left, bottom-left
+    extremes = [np.argmin(y), np.argmax(x - y), np.argmax(x), np.argmax(x + y),
+                np.argmax(y), np.argmin(x - y), np.argmin(x), np.argmin(x + y)]
+
+    polygon = []
+    for ix in extremes:
+        p = tuple(points[ix])
+        if not polygon or (p != polygon[-1] and p != polygon[0]):
+            polygon.append(p)
+
+    if len(polygon) < 3:
+        return points
+
+    polygon = np.array(polygon)
+    inside = np.ones(len(points), dtype=bool)
+    for a, b in zip(polygon, np.roll(polygon, -1, axis=0)):
+        inside &= orient_batch(a, b, points) > 0
+
+    return points[~inside]
+
+
+def half_hull(points):
+    chain = []
+    for p in points:
+        while len(chain) > 1 and orient(chain[-2], chain[-1], p) <= 0:
+            chain.pop()
+        chain.append(p)
+    return chain
+
+
+def monotone_chain(Q, prefilter=True):
+    """
+    Andrew's monotone chain in O(n log n).
+    Collinear points on hull edges are skipped, just like in graham_algorithm.
+    :param Q: list of points [(x1, y1), ...] or an array of shape (n, 2)
+    :param prefilter: drop interior points with akl_toussaint_filter first
+    :return: hull vertices in counter-clockwise order as a list of tuples
+    """
+    points = as_points(Q)
+    if prefilter:
+        points = akl_toussaint_filter(points)
+
+    points = points[np.lexsort((points[:, 1], points[:, 0]))]
+    if len(points) > 1:
+        points = points[np.r_[True, np.any(points[1:] != points[:-1], axis=1)]]
+    if len(points) < 3:
+        return to_tuples(points)
+
+    points = to_tuples(points)
+    lower = half_hull(points)
+    upper = half_hull(reversed(points))
+
+    return lower[:-1] + upper[:-1]
+
+
+def lowest_point(points):
+    """
+    Index of the point with the smallest y (and the smallest x among those), like find_leftmost
+    """
+    lowest = np.nonzero(points[:, 1] == points[:, 1].min())[0]
+    return lowest[np.argmin(points[lowest, 0])]
+
+
+def jarvis_next(points, p, direction):
+    """
+    One gift wrapping step: the next hull vertex after p, when the hull arrived at p going in direction.
+    All points lie at angles 0..pi from direction, where the cosine decreases, so the candidate is one
+    argmax of the cross products with direction turned clockwise (dot products) divided by the distances.
+    Only points whose cosines are within rounding of the candidate's can be to the right of it or collinear
+    with it, so just these few are checked with orient_batch. Of collinear candidates the farthest one is taken.
+    :return: index of the next hull vertex
+    """
+    v = points - points[p]
+    sq_dist = np.einsum('ij,ij->i', v, v)
+
+    direction = np.asarray(direction, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cosine = (v @ (direction / np.hypot(*direction))) / np.sqrt(sq_dist)
+    cosine[sq_dist == 0] = -np.inf
+
+    candidate = np.argmax(cosine)
+    while True:
+        near = np.nonzero(cosine >= cosine[candidate] - COSINE_TOLERANCE)[0]
+        near = near[near != candidate]
+        side = orient_batch(points[p], points[candidate], points[near])
+
+        right = near[side < 0]
+        if len(right) == 0:
+            break
+        candidate = right[np.argmax(cosine[right])]
+
+    collinear = np.append(near[(side == 0) & (v[near] @ v[candidate] > 0)], candidate)
+    return collinear[np.argmax(sq_dist[collinear])]
+
+
+def jarvis(Q):
+    """
+    Gift wrapping in O(nh) with every step vectorized over all points.
+    :param Q: list of points [(x1, y1), ...] or an array of shape (n, 2)
+    :return: hull vertices in counter-clockwise order as a list of tuples, starting from the lowest point
+    """
+    points = as_points(Q)
+    if len(np.unique(points, axis=0)) < 3:
+        return monotone_chain(points, prefilter=False)
+
+    start = lowest_point(points)
+    hull = [start]
+    direction = (1.0, 0.0)
+
+    while True:
+        nxt = jarvis_next(points, hull[-1], direction)
+        if np.array_equal(points[nxt], points[start]):
+            break
+
+        direction = tuple(points[nxt] - points[hull[-1]])
+        hull.append(nxt)
+
+    return to_tuples(points[hull])
+
+
+def sq_distance(a, b):
+    return (a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2
+
+
+def tangent(polygon, p):
+    """
+    Vertex of a counter-clockwise convex polygon that gift wrapping from p would pick
+    (every vertex to the left of or on the line from p to it, the farthest one if several),
+    found by binary search in O(log k).
+    :param polygon: list of k >= 3 vertices in counter-clockwise order, without collinear vertices
+    :param p: point outside the polygon
+    :return: index of the vertex
+    """
+    k = len(polygon)
+
+    def above(i, j):
+        return orient(p, polygon[i % k], polygon[j % k]) < 0
+
+    def below(i, j):
+        return orient(p, polygon[i % k], polygon[j % k]) > 0
+
+    def is_tangent(i):
+        return not above(i, i + 1) and not above(i, i - 1)
+
+    if is_tangent(0):
+        ix = 0
+    else:
+        ix = None
+        a, b = 0, k
+        while b - a > 1:
+            c = (a + b) // 2
+            if is_tangent(c):
+                ix = c
+                break
+
+            up_a = above(a, a + 1)
+            down_c = below(c, c + 1)
+            if up_a:
+                if down_c or above(c, a):
+                    b = c
+                else:
+                    a = c
+            else:
+                if not down_c or not below(c, a):
+                    a = c
+                else:
+                    b = c
+
+        if ix is None:
+            # degenerate configurations (p collinear with an edge) fall back to a linear scan
+            ix = next(i for i in range(k) if is_tangent(i))
+
+    for step in (1, -1):
+        nxt = (ix + step) % k
+        if orient(p, polygon[ix], polygon[nxt]) == 0 and sq_distance(p, polygon[nxt]) > sq_distance(p, polygon[ix]):
+            ix = nxt
+
+    return ix
+
+
+def wrap_hulls(hulls, start, limit):
+    """
+    Gift wrapping over the convex hulls of the groups in Chan's algorithm
+    :param hulls: counter-clockwise hulls of the groups
+    :param start: (group, vertex index) of the lowest point
+    :param limit: maximum number of hull vertices
+    :return: hull vertices, or None if the hull has more than limit vertices
+    """
+    group, ix = start
+    hull = [hulls[group][ix]]
+
+    for _ in range(limit):
+        p = hull[-1]
+
+        candidates = []
+        for g, polygon in enumerate(hulls):
+            if g == group:
+                if len(polygon) > 1:
+                    candidates.append((g, (ix + 1) % len(polygon)))
+            elif len(polygon) < 3:
+                candidates.extend((g, i) for i in range(len(polygon)))
+            else:
+                candidates.append((g, tangent(polygon, p)))
+
+        group, ix = candidates[0]
+        for g, i in candidates[1:]:
+            best, q = hulls[group][ix], hulls[g][i]
+            side = orient(p, best, q)
+            if side < 0 or (side == 0 and sq_distance(p, q) > sq_distance(p, best)):
+                group, ix = g, i
+
+        if hulls[group][ix] == hull[0]:
+            return hull
+        hull.append(hulls[group][ix])
+
+    return None
+
+
+def chan(Q):
+    """
+    Chan's algorithm in O(n log h): hulls of groups of m points are wrapped together
+    in at most m steps, squaring m until the whole hull fits.
+    :param Q: list of points [(x1, y1), ...] or an array of shape (n, 2)
+    :return: hull vertices in counter-clockwise order as a list of tuples, starting from the lowest point
+    """
+    points = akl_toussaint_filter(as_points(Q))
+    points = points[np.lexsort((points[:, 1], points[:, 0]))]
+    if len(points) > 1:
+        points = points[np.r_[True, np.any(points[1:] != points[:-1], axis=1)]]
+
+    n = len(points)
+    if n < 3:
+        return to_tuples(points)
+
+    lowest = tuple(points[lowest_point(points)].tolist())
+
+    t = 1
+    while True:
+        m = min(2 ** (2 ** t), n)
+        hulls = [monotone_chain(points[i:i + m], prefilter=False) for i in range(0, n, m)]
+
+        if len(hulls) == 1:
+            hull = hulls[0]
+        else:
+            start = next((g, polygon.index(lowest)) for g, polygon in enumerate(hulls) if lowest in polygon)
+            hull = wrap_hulls(hulls, start, m)
+
+        if hull is not None:
+            if lowest in hull:
+                ix = hull.index(lowest)
+                hull = hull[ix:] + hull[:ix]
+            return hull
+
+        t += 1
@@ -1,6 +1,7 @@
 import matplotlib.pyplot as plt
 from os import listdir
 import json
+from bitalg.dataset import save_dataset, load_dataset
 
 
 class PolygonBuilder:
@@ -88,15 +89,21 @@ class PolygonBuilder:
     def save_polygon(self):
         points = self.get_points()
 
+        if self.file_name.endswith(".npy"):
+            save_dataset(self.file_name, points)
+            return
+
         file_out = open(self.file_name, "w")
         file_out.write(json.dumps(points))
 
     def load_polygon(self):
         self.clear_polygon()
 
-        file_in = open(self.file_name, "r")
-
-        points_arr = json.loads(file_in.readline())
+        if self.file_name.endswith(".npy"):
+            points_arr = load_dataset(self.file_name, mmap=False).tolist()
+        else:
+            file_in = open(self.file_name, "r")
+            points_arr = json.loads(file_in.readline())
 
         self.point_xs, self.point_ys = list(zip(*points_arr))
         self.point_xs, self.point_ys = list(self.point_xs), list(self.point_ys)
@@ -0,0 +1,82 @@
+import numpy as np
+from bitalg.predicates import orient_batch
+
+
+def as_segments(sections):
+    """
+    Converts [((x1, y1), (x2, y2)), ...] into an array of shape (m, 2, 2)
+    """
+    return np.asarray(sections, dtype=float).reshape(-1, 2, 2)
+
+
+def segments_intersect(first, second):
+    """
+    Intersects first[k] with second[k] in one pass, using the same formulas as Segment.get_intersect
+    :param first: segments of shape (..., 2, 2)
+    :param second: segments of shape (..., 2, 2), broadcastable against first
+    :return: (intersection points of shape (..., 2), validity mask of shape (...))
+    """
+    Ax, Ay = first[..., 0, 0], first[..., 0, 1]
+    Cx, Cy = second[..., 0, 0], second[..., 0, 1]
+
+    ABx, ABy = first[..., 1, 0] - Ax, first[..., 1, 1] - Ay
+    CDx, CDy = second[..., 1, 0] - Cx, second[..., 1, 1] - Cy
+
+    ACx, ACy = Ax - Cx, Ay - Cy
+
+    W = ABx * CDy - CDx * ABy
+    Wt = ABx * ACy - ACx * ABy
+
+    parallel = W == 0
+    W = np.where(parallel, 1, W)
+
+    t = Wt / W
+
+    points = np.stack((Cx + t * CDx, Cy + t * CDy), axis=-1)
+
+    # the same exact orientation tests as Segment.get_intersect, so both engines agree on borderline pairs
+    A, B = first[..., 0, :], first[..., 1, :]
+    C, D = second[..., 0, :], second[..., 1, :]
+    mask = ~parallel & (orient_batch(A, B, C) != orient_batch(A, B, D)) & (orient_batch(C, D, A) != orient_batch(C, D, B))
+
+    return points, mask
+
+
+def intersect_pairs(segments, pairs):
+    """
+    :param segments: segments of shape (m, 2, 2)
+    :param pairs: segment index pairs of shape (p, 2)
+    :return: (intersection points of shape (p, 2), validity mask of shape (p,))
+    """
+    segments = np.asarray(segments, dtype=float)
+    pairs = np.asarray(pairs, dtype=np.intp).reshape(-1, 2)
+
+    return segments_intersect(segments[pairs[:, 0]], segments[pairs[:, 1]])
+
+
+def brute_force_intersections(sections, block_size=512):
+    """
+    Checks every pair of segments in block_size x block_size blocks of the pair matrix
+    :param sections: segments as [((x1, y1), (x2, y2)), ...]
+    :param block_size: side of a block of the pair matrix
+    :return: intersections in the find_intersections format, [(point, i+1, j+1), ...]
+    """
+    segments = as_segments(sections)
+    n = len(segments)
+
+    result = []
+    for i_start in range(0, n, block_size):
+        rows = segments[i_start:i_start + block_size, None]
+        row_ids = np.arange(i_start, i_start + len(rows))[:, None]
+
+        for j_start in range(i_start, n, block_size):
+            cols = segments[None, j_start:j_start + block_size]
+            col_ids = np.arange(j_start, j_start + cols.shape[1])[None, :]
+
+            points, mask = segments_intersect(rows, cols)
+            mask &= row_ids < col_ids
+
+            ii, jj = np.nonzero(mask)
+            result.extend(zip(map(tuple, points[ii, jj].tolist()), (ii + i_start + 1).tolist(), (jj + j_start + 1).tolist()))
+
+    return result
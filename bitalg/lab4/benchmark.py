@@ -1,46 +1,16 @@
-from set_state import find_intersections as set_find
+import tracemalloc
+from set_state import find_intersections as set_find, iter_intersections
 from list_state import find_intersections as list_find
-import numpy as np
-import pandas as pd
-from time import process_time
+from bitalg.generators import uniform_sections, to_tuples
+from bitalg.benchmark import run_benchmark, save_results
 
 
 MAX_X = 200
 MAX_Y = 200
 
 
-def generate_uniform_sections(max_x, max_y, n):
-    def generate_different(max_val, diff_set, n):
-        tab = []
-
-        while len(tab) < n:
-            val = np.random.rand(1)[0] * max_val
-            if val not in diff_set:
-                tab.append(val)
-
-        return tab
-
-    def generate_without_rep(max_val, n):
-        s = set()
-        tab = []
-
-        while len(s) < n:
-            val = np.random.rand(1)[0] * max_val
-            if val not in s:
-                s.add(val)
-                tab.append(val)
-
-        return tab
-
-    x1 = list(np.random.rand(n) * max_x)
-    x2 = generate_without_rep(max_x, n)
-    y1 = list(np.random.rand(n) * max_y)
-    y2 = generate_different(max_y, y1, n)
-
-    return [((x1[i], y1[i]), (x2[i], y2[i])) for i in range(n)]
-
-
-comparison_df = pd.DataFrame(columns=["state_type", "size", "time"])
+def generate_uniform_sections(max_x, max_y, n, rng=None):
+    return to_tuples(uniform_sections(n, max_x, max_y, rng))
 
 
 def n_range():
@@ -50,23 +20,48 @@ def n_range():
         n += 1e2
 
 
-def add_test(comparison_df, segments,  algorithm, df_dict):
-    timer_start = process_time()
-    _ = algorithm(segments)
-    timer_stop = process_time()
-    df_dict["time"] = round(timer_stop-timer_start, 3)
-    comparison_df.loc[len(comparison_df)] = df_dict
+def test(repeat=5, warmup=1, workers=1):
+    return run_benchmark(
+        {"set": set_find, "list": list_find},
+        {"uniform": lambda n, rng: generate_uniform_sections(MAX_X, MAX_Y, n, rng)},
+        n_range(), repeat=repeat, warmup=warmup, workers=workers,
+    )
+
+
+def streaming_memory(sizes=(200, 400, 800)):
+    """
+    Peak memory of streaming iter_intersections over uniform sections, dropping every intersection
+    :return: list of (n, k, peak memory in bytes)
+    """
+    rows = []
+    for n in sizes:
+        sections = generate_uniform_sections(MAX_X, MAX_Y, n, rng=n)
+
+        tracemalloc.start()
+        try:
+            k = sum(1 for _ in iter_intersections(sections))
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        rows.append((n, k, peak))
+    return rows
 
 
-def test():
-    for n in n_range():
-        segments = generate_uniform_sections(MAX_X, MAX_Y, n)
+def check_streaming_memory(sizes=(200, 400, 800), tolerance=1.5):
+    """
+    While streaming, the sweep keeps only its status and pending events, so the peak memory
+    per segment stays flat although k grows like n^2
+    :param tolerance: allowed ratio of the largest and the smallest peak per segment
+    """
+    rows = streaming_memory(sizes)
+    per_segment = [peak / n for n, _, peak in rows]
+    assert max(per_segment) <= tolerance * min(per_segment), f"memory grows with k: {rows}"
+    return rows
 
-        add_test(comparison_df, segments, set_find, {"state_type": "set", "size": n})
-        add_test(comparison_df, segments, list_find, {"state_type": "list", "size": n})
 
-        print(n)
+comparison_df = test()
 
-test()
+save_results(comparison_df, 'tests.csv')
 
-comparison_df.to_csv('tests.csv', index=False)
+check_streaming_memory()
@@ -0,0 +1,102 @@
+import numpy as np
+from batch_intersect import as_segments, intersect_pairs, brute_force_intersections
+
+# when the grid yields more candidates than this share of all pairs, k is about n^2 anyway
+# and checking every pair in blocks is faster than collecting the candidates
+BRUTE_FORCE_SHARE = 0.25
+
+
+def grid_cells(segments, low, cell_size, cells_per_axis, eps=1e-9):
+    """
+    Walks every segment through the grid: it enters a new cell at each grid line it crosses,
+    so the cells around its endpoints and crossing points are all the cells it touches.
+    Cells within eps (in cell sizes) of these points are included as well, so rounding
+    cannot separate two segments meeting on a grid line or in a corner.
+    :return: (segment ids, cell codes cx * cells_per_axis + cy), possibly with repetitions
+    """
+    n = len(segments)
+    start = (segments[:, 0] - low) / cell_size
+    direction = (segments[:, 1] - low) / cell_size - start
+
+    first = np.clip(np.floor(start), 0, cells_per_axis - 1).astype(np.intp)
+    last = np.clip(np.floor(start + direction), 0, cells_per_axis - 1).astype(np.intp)
+
+    ids, points = [np.arange(n), np.arange(n)], [start, start + direction]
+    for axis in range(2):
+        # grid lines of this axis crossed between the two end cells, found for all segments at once
+        count = np.abs(last[:, axis] - first[:, axis])
+        crossing_ids = np.repeat(np.arange(n), count)
+        offsets = np.arange(len(crossing_ids)) - np.repeat(np.cumsum(count) - count, count)
+        lines = np.repeat(np.minimum(first[:, axis], last[:, axis]), count) + 1 + offsets
+
+        t = (lines - start[crossing_ids, axis]) / direction[crossing_ids, axis]
+        ids.append(crossing_ids)
+        points.append(start[crossing_ids] + t[:, None] * direction[crossing_ids])
+
+    ids, points = np.concatenate(ids), np.concatenate(points)
+
+    lower = np.clip(np.floor(points - eps), 0, cells_per_axis - 1).astype(np.int64)
+    upper = np.clip(np.floor(points + eps), 0, cells_per_axis - 1).astype(np.int64)
+    cells = [x * cells_per_axis + y for x in (lower[:, 0], upper[:, 0]) for y in (lower[:, 1], upper[:, 1])]
+
+    return np.tile(ids, 4), np.concatenate(cells)
+
+
+def grid_candidate_pairs(segments, cells_per_axis=None, max_candidates=None):
+    """
+    Buckets segments into the cells of a uniform grid over their bounding box which they cross
+    and returns every pair of segments sharing at least one cell
+    :param segments: segments of shape (n, 2, 2)
+    :param cells_per_axis: grid resolution, ceil(sqrt(n)) by default
+    :param max_candidates: give up if the cells hold more pairs than this (counting a pair once per shared cell)
+    :return: unique index pairs (i < j) of shape (p, 2), or None if max_candidates was exceeded
+    """
+    n = len(segments)
+    if n < 2:
+        return np.empty((0, 2), dtype=np.intp)
+
+    cells_per_axis = cells_per_axis or int(np.ceil(np.sqrt(n)))
+
+    low = segments.reshape(-1, 2).min(axis=0)
+    high = segments.reshape(-1, 2).max(axis=0)
+    cell_size = (high - low) / cells_per_axis
+    cell_size[cell_size == 0] = 1
+
+    ids, cells = grid_cells(segments, low, cell_size, cells_per_axis)
+
+    # one sort of all (cell, segment) entries groups them by cell and drops the repetitions
+    entries = np.unique(cells * n + ids)
+    cells, ids = entries // n, entries % n
+
+    group_starts = np.flatnonzero(np.append(True, cells[1:] != cells[:-1]))
+    group_sizes = np.diff(np.append(group_starts, len(entries)))
+    if max_candidates is not None and np.sum(group_sizes * (group_sizes - 1) // 2) > max_candidates:
+        return None
+
+    # every entry is paired with the entries after it in its cell, ids within a cell are ascending
+    count = np.repeat(group_starts + group_sizes, group_sizes) - np.arange(len(entries)) - 1
+    first = np.repeat(np.arange(len(entries)), count)
+    second = first + 1 + np.arange(len(first)) - np.repeat(np.cumsum(count) - count, count)
+
+    codes = np.unique(ids[first] * n + ids[second])
+    return np.stack((codes // n, codes % n), axis=1).astype(np.intp)
+
+
+def find_intersections_grid(sections, cells_per_axis=None):
+    """
+    Finds all intersections by testing only the pairs of segments that share a grid cell,
+    or every pair with brute_force_intersections if so many pairs share a cell that k is about n^2 anyway
+    :param sections: segments as [((x1, y1), (x2, y2)), ...]
+    :param cells_per_axis: grid resolution, ceil(sqrt(n)) by default
+    :return: intersections in the find_intersections format, [(point, i+1, j+1), ...]
+    """
+    segments = as_segments(sections)
+    n = len(segments)
+    pairs = grid_candidate_pairs(segments, cells_per_axis, BRUTE_FORCE_SHARE * n * (n - 1) / 2)
+    if pairs is None:
+        return brute_force_intersections(sections)
+
+    points, mask = intersect_pairs(segments, pairs)
+    pairs = pairs[mask] + 1
+
+    return list(zip(map(tuple, points[mask].tolist()), pairs[:, 0].tolist(), pairs[:, 1].tolist()))
@@ -43,12 +43,10 @@ class Event:
         return event_2_y-event_1_y
 
     @staticmethod
-    def get_sweep_intersect(e):
+    def get_sweep_intersect(e, sweep_x):
         if not e.end_position:
             return e.position[1]
 
-        global sweep_x
-
         A = e.position[0]
 
         t = (sweep_x - A) / e.vector[0]
@@ -56,9 +54,9 @@ class Event:
         return e.position[1] + t * e.vector[1]
 
     @staticmethod
-    def cmp_ys(event_1, event_2):
-        p1_y = Event.get_sweep_intersect(event_1)
-        p2_y = Event.get_sweep_intersect(event_2)
+    def cmp_ys(event_1, event_2, sweep_x):
+        p1_y = Event.get_sweep_intersect(event_1, sweep_x)
+        p2_y = Event.get_sweep_intersect(event_2, sweep_x)
 
         return p2_y - p1_y
 
@@ -147,9 +145,15 @@ class State:
         self.state[ix1], self.state[ix2] = self.state[ix2], self.state[ix1]
 
 
+class SweepContext:
+    def __init__(self, x=None):
+        self.x = x
+
+
 class Sweep(State):
     def __init__(self, cmp_fun):
-        super().__init__(cmp_fun)
+        self.context = SweepContext()
+        super().__init__(lambda event_1, event_2: cmp_fun(event_1, event_2, self.context.x))
 
 
 class EventsState(State):
@@ -175,8 +179,6 @@ def find_intersections(sections):
             return (beg, end)
         return (end, beg)
 
-    global sweep_x
-
     sections = [swap(val) for val in sections]
 
     sections_end = [Event(position=value[1], segment_id=ix, type=EventType.END) for ix, value in enumerate(sections)]
@@ -192,7 +194,7 @@ def find_intersections(sections):
 
     while events.has_next():
         e = events.next()
-        sweep_x = e.position[0]
+        sweep.context.x = e.position[0]
 
         events_to_check = []
 
@@ -2,6 +2,7 @@ import matplotlib.pyplot as plt
 from os import listdir
 import json
 from matplotlib.collections import LineCollection
+from bitalg.dataset import save_dataset, load_dataset
 
 
 class SegmentBuilder:
@@ -80,13 +81,19 @@ class SegmentBuilder:
         self.ax.add_collection(LineCollection(self.segments))
 
     def save_segments(self):
+        if self.file_name.endswith(".npy"):
+            save_dataset(self.file_name, self.segments)
+            return
+
         file_out = open(self.file_name, "w")
         file_out.write(json.dumps(self.segments))
 
     def load_segments(self):
-        file_in = open(self.file_name, "r")
-
-        self.segments = json.loads(file_in.readline())
+        if self.file_name.endswith(".npy"):
+            self.segments = load_dataset(self.file_name, mmap=False).tolist()
+        else:
+            file_in = open(self.file_name, "r")
+            self.segments = json.loads(file_in.readline())
 
         self.ax.plot(*self.get_segments_parsed(), 'b.')
         self.draw_segments()
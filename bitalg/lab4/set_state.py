@@ -1,6 +1,10 @@
-from sortedcontainers import SortedSet
-from functools import cmp_to_key
+from heapq import heappush, heappop
 from enum import Enum
+from concurrent.futures import ProcessPoolExecutor
+from sweep_status import SweepStatus
+from grid_engine import find_intersections_grid
+from batch_intersect import as_segments, intersect_pairs
+from bitalg.predicates import orient
 
 
 def det(a, b, c, d):
@@ -13,73 +17,54 @@ class EventType(Enum):
     INTERSECT = 2
 
 
-class Event:
-    def __init__(self, position, type, segment_id=None, end_position=None, intersect_ids=None):
-        self.position = position
-        self.segment_id = segment_id
-        self.end_position = end_position
-        self.type = type
-        self.intersect_ids = intersect_ids
+# at the same point a segment has to be on the sweep before it crosses anything and until it did
+EVENT_ORDER = {EventType.BEGIN: 0, EventType.INTERSECT: 1, EventType.END: 2}
 
-        if self.end_position:
-            self.vector = (self.end_position[0] - self.position[0], self.end_position[1] - self.position[1])
 
-    def __eq__(self, other):
-        if self.type != other.type:
-            return False
+class Segment:
+    """
+    Segment geometry, stored once per segment id. The sweep status holds
+    segments and events only refer to them by id.
 
-        if self.type == EventType.INTERSECT:
-            return min(self.intersect_ids) == min(other.intersect_ids) and max(self.intersect_ids) == max(other.intersect_ids)
+    Slope and intercept are computed once, and the y at the sweep is cached
+    for the last sweep x it was asked for. A vertical segment has no slope and
+    is placed on the sweep at the y of its begin (upper) point.
+    """
+    __slots__ = ("segment_id", "position", "end_position", "vector", "y_low", "y_high", "slope", "intercept", "cached_x", "cached_y")
 
-        return self.segment_id == other.segment_id
+    def __init__(self, segment_id, position, end_position):
+        self.segment_id = segment_id
+        self.position = position
+        self.end_position = end_position
+        self.vector = (end_position[0] - position[0], end_position[1] - position[1])
+        self.y_low, self.y_high = min(position[1], end_position[1]), max(position[1], end_position[1])
 
-    def __hash__(self):
-        if self.type == EventType.INTERSECT:
-            return hash((min(self.intersect_ids), max(self.intersect_ids), self.type))
-        return hash((self.segment_id, self.segment_id, self.type))
+        if self.vector[0] == 0:
+            self.slope = None
+            self.intercept = position[1]
+        else:
+            self.slope = self.vector[1] / self.vector[0]
+            self.intercept = position[1] - self.slope * position[0]
 
-    def __str__(self):
-        if self.type == EventType.INTERSECT:
-            return f"{self.type} {min(self.intersect_ids)} {max(self.intersect_ids)}"
-        return f"{self.type} {self.segment_id}"
+        self.cached_x = None
+        self.cached_y = None
 
     def __repr__(self):
-        if self.type == EventType.INTERSECT:
-            return f"{self.type} {min(self.intersect_ids)} {max(self.intersect_ids)}"
-        return f"{self.type} {self.segment_id}"
+        return f"Segment {self.segment_id}"
 
     @staticmethod
-    def cmp_xs(event_1, event_2):
-        event_1_x, event_1_y = event_1.position
-        event_2_x, event_2_y = event_2.position
+    def get_sweep_intersect(e, sweep_x):
+        if e.cached_x != sweep_x:
+            e.cached_x = sweep_x
+            e.cached_y = e.intercept if e.slope is None else e.slope * sweep_x + e.intercept
 
-        if event_1_x != event_2_x:
-            return event_1_x-event_2_x
-
-        return event_2_y-event_1_y
+        return e.cached_y
 
     @staticmethod
-    def get_sweep_intersect(e):
-        if not e.end_position:
-            return e.position[1]
-
-        A = e.position[0]
-
-        global sweep_x
-        global previous_sweep_x
-        global use_previous
-
-        x = previous_sweep_x if use_previous else sweep_x
-
-        t = (x - A) / e.vector[0]
-
-        return e.position[1] + t * e.vector[1]
-
-    @staticmethod
-    def cmp_ys(event_1, event_2):
+    def cmp_ys(segment_1, segment_2, sweep_x):
         EPS = 1e-10
-        p1_y = Event.get_sweep_intersect(event_1)
-        p2_y = Event.get_sweep_intersect(event_2)
+        p1_y = Segment.get_sweep_intersect(segment_1, sweep_x)
+        p2_y = Segment.get_sweep_intersect(segment_2, sweep_x)
 
         if p2_y - p1_y > EPS:
             return 1
@@ -89,18 +74,42 @@ class Event:
         return 0
 
     @staticmethod
-    def get_intersect(event_1, event_2):
-        if event_1 is None or event_2 is None:
+    def clamp(p, segment_1, segment_2):
+        """
+        Keeps a computed intersection inside both segments' bounding boxes, so rounding
+        cannot put the event after the END (or before the BEGIN) of a vertical or short segment
+        """
+        x, y = p
+
+        if x < segment_1.position[0]: x = segment_1.position[0]
+        if x < segment_2.position[0]: x = segment_2.position[0]
+        if x > segment_1.end_position[0]: x = segment_1.end_position[0]
+        if x > segment_2.end_position[0]: x = segment_2.end_position[0]
+
+        if y < segment_1.y_low: y = segment_1.y_low
+        if y < segment_2.y_low: y = segment_2.y_low
+        if y > segment_1.y_high: y = segment_1.y_high
+        if y > segment_2.y_high: y = segment_2.y_high
+
+        return x, y
+
+    @staticmethod
+    def get_intersect(segment_1, segment_2):
+        if segment_1 is None or segment_2 is None:
             return None
-        if event_1.type == EventType.INTERSECT or event_2.type == EventType.INTERSECT:
+
+        # whether the segments cross is decided by exact orientation tests, only the point is computed in floats
+        if orient(segment_1.position, segment_1.end_position, segment_2.position) == orient(segment_1.position, segment_1.end_position, segment_2.end_position):
+            return None
+        if orient(segment_2.position, segment_2.end_position, segment_1.position) == orient(segment_2.position, segment_2.end_position, segment_1.end_position):
             return None
 
-        Ax, Ay = event_1.position
-        Cx, Cy = event_2.position
+        Ax, Ay = segment_1.position
+        Cx, Cy = segment_2.position
 
-        ABx, ABy = event_1.vector
+        ABx, ABy = segment_1.vector
 
-        CDx, CDy = event_2.vector
+        CDx, CDy = segment_2.vector
 
         W = det(CDx, -ABx, CDy, -ABy)
 
@@ -110,141 +119,266 @@ class Event:
         Wt = det(Ax-Cx, -ABx, Ay-Cy, -ABy)
         t = Wt/W
 
-        Wm = det(CDx, Ax-Cx, CDy, Ay-Cy)
-        m = Wm/W
+        return Event(position=Segment.clamp((Cx + t * CDx, Cy + t * CDy), segment_1, segment_2), type=EventType.INTERSECT, intersect_ids=(segment_1.segment_id, segment_2.segment_id))
 
-        p = (Cx + t * CDx, Cy + t * CDy)
 
-        if 0 <= t and t <= 1 and 0 <= m and m <= 1:
-            return Event(position=p, type=EventType.INTERSECT, intersect_ids=[event_1.segment_id, event_2.segment_id])
-        return None
+class Event:
+    __slots__ = ("position", "type", "segment_id", "intersect_ids")
+
+    def __init__(self, position, type, segment_id=None, intersect_ids=None):
+        self.position = position
+        self.type = type
+        self.segment_id = segment_id
+        self.intersect_ids = intersect_ids
 
+    def __repr__(self):
+        if self.type == EventType.INTERSECT:
+            return f"{self.type} {min(self.intersect_ids)} {max(self.intersect_ids)}"
+        return f"{self.type} {self.segment_id}"
 
-class State:
-    def __init__(self, cmp_fun):
-        self.cmp_fun = cmp_fun
-        self.state = SortedSet(key=cmp_to_key(cmp_fun))
+    @staticmethod
+    def key_xs(e):
+        x, y = e.position
+        return x, -y, EVENT_ORDER[e.type]
+
+
+class EventQueue:
+    """
+    Events ordered by x (ties: higher y first, then EVENT_ORDER) in a binary heap.
+
+    Processed events are popped and dropped. An intersection is only scheduled
+    if it is not behind the last popped event: a pair becoming neighbours again
+    after its crossing was handled finds it behind the sweep. Several crossings
+    at one point are computed with slightly different rounding, so positions
+    within EPS (as in Segment.cmp_ys) count as the same point, and the pairs
+    handled at it are kept until the sweep leaves it. Apart from them only the
+    pending pairs are kept, so the memory does not grow with k.
+    """
+    EPS = 1e-10
+
+    def __init__(self):
+        self.heap = []
+        self.counter = 0
+        self.pending_pairs = set()
+        self.point = None
+        self.handled_pairs = set()
 
     def insert(self, e):
         if e is None:
             return
-        if e.type == EventType.INTERSECT and e in self.state:
-            return
+        if e.type == EventType.INTERSECT:
+            pair = (min(e.intersect_ids), max(e.intersect_ids))
+            if pair in self.pending_pairs:
+                return
+            if self.point is not None:
+                (x, y), (x0, y0) = e.position, self.point
+                if x < x0 - self.EPS or x <= x0 + self.EPS and y > y0 + self.EPS:
+                    return
+                if self.at_point(e.position) and pair in self.handled_pairs:
+                    return
+            self.pending_pairs.add(pair)
+
+        heappush(self.heap, (*Event.key_xs(e), self.counter, e))
+        self.counter += 1
+
+    def at_point(self, position):
+        return abs(position[0] - self.point[0]) <= self.EPS and abs(position[1] - self.point[1]) <= self.EPS
 
-        self.state.add(e)
+    def next(self):
+        e = heappop(self.heap)[-1]
 
-    def remove(self, e):
-        if e is None:
-            return
+        if self.point is None or not self.at_point(e.position):
+            self.point = e.position
+            self.handled_pairs.clear()
 
-        self.state.remove(e)
+        if e.type == EventType.INTERSECT:
+            pair = (min(e.intersect_ids), max(e.intersect_ids))
+            self.pending_pairs.remove(pair)
+            self.handled_pairs.add(pair)
 
-    def get_neighbours(self, e):
-        if e is None:
-            return [None, None]
+        return e
 
-        ix = self.state.index(e)
+    def has_next(self):
+        return len(self.heap) > 0
 
-        return [self.state[ix - 1] if ix - 1 >= 0 else None, self.state[ix + 1] if ix + 1 < len(self.state) else None]
 
+def clip_to_slab(section, x_low, x_high):
+    (x1, y1), (x2, y2) = section
+    if x1 > x2:
+        (x1, y1), (x2, y2) = (x2, y2), (x1, y1)
 
-class Sweep(State):
-    def __init__(self, cmp_fun):
-        super().__init__(cmp_fun)
+    def y_at(x):
+        return y1 + (x - x1) * (y2 - y1) / (x2 - x1)
 
+    if x1 < x_low:
+        x1, y1 = x_low, y_at(x_low)
+    if x2 > x_high:
+        x2, y2 = x_high, y_at(x_high)
 
-class EventsState(State):
-    def __init__(self, cmp_fun):
-        super().__init__(cmp_fun)
-        self.current_ix = 0
+    return ((x1, y1), (x2, y2))
 
-    def next(self):
-        self.current_ix += 1
-        return self.state[self.current_ix-1]
 
-    def has_next(self):
-        return len(self.state) > self.current_ix
+def slab_ids(sections, x_low, x_high):
+    """
+    Ids of the segments sharing at least one point with the closed slab [x_low, x_high].
+    Segments which only touch it (vertical ones on a boundary included) are kept,
+    as they may intersect others right on the boundary.
+    """
+    return [ix for ix, ((x1, _), (x2, _)) in enumerate(sections) if min(max(x1, x2), x_high) >= max(min(x1, x2), x_low)]
+
+
+def slab_intersections(sections, ids, x_low, x_high, closed, engine):
+    """
+    Runs a single engine on the segments clipped to the slab [x_low, x_high)
+    ([x_low, x_high] if closed). Points are recomputed on the original segments,
+    so every slab decides ownership of a shared intersection the same way.
+    :param sections: original segments overlapping the slab
+    :param ids: global ids of these segments, ascending
+    :return: intersections owned by the slab, [(point, i+1, j+1), ...]
+    """
+    found = find_intersections([clip_to_slab(val, x_low, x_high) for val in sections], engine=engine)
+    if not found:
+        return []
+
+    pairs = [(min(a, b) - 1, max(a, b) - 1) for _, a, b in found]
+    points, mask = intersect_pairs(as_segments(sections), pairs)
 
-    def get_intersects(self):
-        return [(e.position, *e.intersect_ids) for e in self.state if e.type == EventType.INTERSECT]
+    result = []
+    for (i, j), point, valid in zip(pairs, points.tolist(), mask.tolist()):
+        if valid and x_low <= point[0] and (point[0] < x_high or closed and point[0] == x_high):
+            result.append((tuple(point), ids[i] + 1, ids[j] + 1))
+    return result
 
 
-def find_intersections(sections):
+def find_intersections_sharded(sections, workers, engine="sweep"):
+    """
+    Splits the x range into `workers` slabs holding roughly the same number of
+    endpoints and runs the chosen engine on each slab in a separate process.
+    """
+    xs = sorted(x for section in sections for x, _ in section)
+    if not xs:
+        return []
 
+    bounds = sorted(set([xs[0]] + [xs[len(xs) * k // workers] for k in range(1, workers)] + [xs[-1]]))
+    slabs = list(zip(bounds, bounds[1:])) or [(xs[0], xs[-1])]
+
+    jobs = []
+    for k, (x_low, x_high) in enumerate(slabs):
+        ids = slab_ids(sections, x_low, x_high)
+        jobs.append(([sections[ix] for ix in ids], ids, x_low, x_high, k == len(slabs) - 1, engine))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(slab_intersections, *zip(*jobs))
+
+        return [intersection for result in results for intersection in result]
+
+
+def build_events(sections):
+    """
+    :return: (segments indexed by id with their begin to the left, queue of BEGIN and END events)
+    """
     def swap(coord):
         beg, end = coord
-        if beg[0] < end[0]:
+        if (beg[0], -beg[1]) < (end[0], -end[1]):
             return (beg, end)
         return (end, beg)
 
-    global sweep_x
-    global previous_sweep_x
-    global use_previous
+    segments = [Segment(ix, *swap(val)) for ix, val in enumerate(sections)]
 
-    use_previous = False
-    previous_sweep_x = None
-    sweep_x = None
+    events = EventQueue()
 
+    for segment in segments:
+        events.insert(Event(position=segment.end_position, type=EventType.END, segment_id=segment.segment_id))
+    for segment in segments:
+        events.insert(Event(position=segment.position, type=EventType.BEGIN, segment_id=segment.segment_id))
 
-    sweep_bounds = (min([min(val[0][1], val[1][1]) for val in sections]), max([max(val[0][1], val[1][1]) for val in sections]))
+    return segments, events
 
-    sections = [swap(val) for val in sections]
 
-    sections_end = [Event(position=value[1], segment_id=ix ,type=EventType.END) for ix, value in enumerate(sections)]
-    sections_begin = [Event(position=value[0], segment_id=ix, end_position=value[1], type=EventType.BEGIN) for ix, value in enumerate(sections)]
+def handle_event(sweep, segments, e):
+    """
+    Moves the sweep to e and updates its status
+    :return: pairs of segments which became neighbours and have to be checked for an intersection
+    """
+    sweep.context.x = e.position[0]
 
-    sweep = Sweep(Event.cmp_ys)
-    events = EventsState(Event.cmp_xs)
+    if e.type == EventType.BEGIN:
+        segment = segments[e.segment_id]
+        sweep.insert(segment)
+        prev, nxt = sweep.get_neighbours(segment)
 
-    for e in sections_end:
-        events.insert(e)
-    for e in sections_begin:
-        events.insert(e)
+        return [(prev, segment), (segment, nxt)]
 
-    while events.has_next():
-        e = events.next()
-        previous_sweep_x = sweep_x
-        sweep_x = e.position[0]
+    if e.type == EventType.END:
+        segment = segments[e.segment_id]
+        prev, nxt = sweep.get_neighbours(segment)
 
+        sweep.remove(segment)
 
-        events_to_check = []
+        return [(prev, nxt)]
 
-        if e.type == EventType.BEGIN:
-            sweep.insert(e)
-            prev, nxt = sweep.get_neighbours(e)
+    prev_ix, nxt_ix = e.intersect_ids
+    sweep.swap(prev_ix, nxt_ix)
 
-            events_to_check = [(prev, e), (e, nxt)]
+    prev = segments[prev_ix]
+    nxt = segments[nxt_ix]
 
-        if e.type == EventType.END:
-            begin_event = Event(position=e.position, end_position=e.end_position, type=EventType.BEGIN, segment_id=e.segment_id)
+    prev_neigh_1, prev_neigh_2 = sweep.get_neighbours(prev)
+    nxt_neigh_1, nxt_neigh_2 = sweep.get_neighbours(nxt)
 
-            prev, nxt = sweep.get_neighbours(begin_event)
+    # the swapped pair stays adjacent and has already been handled
+    return [(e1, e2) for e1, e2 in [(prev_neigh_1, prev), (prev, prev_neigh_2), (nxt_neigh_1, nxt), (nxt, nxt_neigh_2)] if not (e1 is prev and e2 is nxt or e1 is nxt and e2 is prev)]
 
-            sweep.remove(begin_event)
 
-            events_to_check = [(prev, nxt)]
+def find_intersections(sections, engine="sweep", workers=None):
+    if workers is not None and workers > 1:
+        return find_intersections_sharded(sections, workers, engine)
 
-        if e.type == EventType.INTERSECT:
-            prev_ix, nxt_ix = e.intersect_ids
-            prev = Event(position = sections[prev_ix][0], end_position=sections[prev_ix][1], type=EventType.BEGIN, segment_id=prev_ix)
-            nxt = Event(position = sections[nxt_ix][0], end_position=sections[nxt_ix][1], type=EventType.BEGIN, segment_id=nxt_ix)
+    if engine == "grid":
+        return find_intersections_grid(sections)
+    if engine != "sweep":
+        raise ValueError('Available engines are "sweep" or "grid".')
 
-            use_previous = True
-            sweep.remove(prev)
-            sweep.remove(nxt)
-            use_previous = False
+    return list(iter_intersections(sections))
 
-            sweep.insert(nxt)
-            sweep.insert(prev)
 
-            prev_neigh_1, prev_neigh_2 = sweep.get_neighbours(prev)
-            nxt_neigh_1, nxt_neigh_2 = sweep.get_neighbours(nxt)
+def iter_intersections(sections):
+    """
+    Yields intersections in sweep order, as soon as the sweep reaches them,
+    in the find_intersections format (point, i+1, j+1). Stopping the generator
+    stops the sweep. Nothing is kept for the intersections already yielded,
+    so streaming needs memory for the sweep status and pending events only.
+    """
+    sweep = SweepStatus(Segment.cmp_ys)
+    segments, events = build_events(sections)
 
-            events_to_check = [(prev_neigh_1, prev), (prev, prev_neigh_2), (nxt_neigh_1, nxt), (nxt, nxt_neigh_2)]
+    while events.has_next():
+        e = events.next()
 
-        for e1, e2 in events_to_check:
-            p = Event.get_intersect(e1, e2)
+        for e1, e2 in handle_event(sweep, segments, e):
+            p = Segment.get_intersect(e1, e2)
 
             events.insert(p)
 
-    return [(a, b+1, c+1) for a, b, c in events.get_intersects()]
+        if e.type == EventType.INTERSECT:
+            a, b = e.intersect_ids
+            yield (e.position, a+1, b+1)
+
+
+def has_intersection(sections):
+    """
+    Stops at the first intersection found between neighbours, so the sweep only
+    ever handles BEGIN and END events and costs O(n log n) regardless of k
+    :return: True / False
+    """
+    sweep = SweepStatus(Segment.cmp_ys)
+    segments, events = build_events(sections)
+
+    while events.has_next():
+        e = events.next()
+
+        for e1, e2 in handle_event(sweep, segments, e):
+            if Segment.get_intersect(e1, e2) is not None:
+                return True
+
+    return False
@@ -53,12 +53,9 @@ class Event:
         return event_2_y-event_1_y
     
     @staticmethod
-    def get_sweep_intersect(e):
+    def get_sweep_intersect(e, sweep_x):
         if not e.end_position:
             return e.position[1]
-        
-        
-        global sweep_x
 
         A = e.position[0]
 
@@ -67,9 +64,9 @@ class Event:
         return e.position[1] + t * e.vector[1]
 
     @staticmethod
-    def cmp_ys(event_1, event_2):
-        p1_y = Event.get_sweep_intersect(event_1)
-        p2_y = Event.get_sweep_intersect(event_2)
+    def cmp_ys(event_1, event_2, sweep_x):
+        p1_y = Event.get_sweep_intersect(event_1, sweep_x)
+        p2_y = Event.get_sweep_intersect(event_2, sweep_x)
 
         return p2_y - p1_y
 
@@ -163,9 +160,15 @@ class State:
 
         self.state[ix1], self.state[ix2] = self.state[ix2], self.state[ix1]
 
+class SweepContext:
+    def __init__(self, x=None):
+        self.x = x
+
+
 class Sweep(State):
     def __init__(self, cmp_fun):
-        super().__init__(cmp_fun)
+        self.context = SweepContext()
+        super().__init__(lambda event_1, event_2: cmp_fun(event_1, event_2, self.context.x))
 
 
 class EventsState(State):
@@ -0,0 +1,165 @@
+from random import random
+
+
+class SweepContext:
+    def __init__(self, x=None):
+        self.x = x
+
+
+class SweepNode:
+    def __init__(self, event):
+        self.event = event
+        self.priority = random()
+        self.left = None
+        self.right = None
+        self.parent = None
+
+
+class SweepStatus:
+    """
+    Sweep line status kept as a treap with a handle (node) per segment id.
+
+    Only insert compares segments; remove, neighbour lookup and the swap done
+    at an intersection work on the handles, so no comparator calls are needed
+    and the order of crossing segments is never recomputed.
+
+    The sweep position lives in the status' own context and is passed to the
+    comparator explicitly, so independent sweeps do not share any state.
+    """
+    def __init__(self, cmp_fun, context=None):
+        self.cmp_fun = cmp_fun
+        self.context = context or SweepContext()
+        self.root = None
+        self.handles = {}
+
+    def __len__(self):
+        return len(self.handles)
+
+    def __contains__(self, e):
+        return e is not None and e.segment_id in self.handles
+
+    def __iter__(self):
+        node = self.first()
+        while node is not None:
+            yield node.event
+            node = self.successor(node)
+
+    def first(self):
+        node = self.root
+        while node is not None and node.left is not None:
+            node = node.left
+        return node
+
+    def insert(self, e):
+        if e is None:
+            return
+
+        node = SweepNode(e)
+        self.handles[e.segment_id] = node
+
+        if self.root is None:
+            self.root = node
+            return
+
+        parent = self.root
+        while True:
+            if self.cmp_fun(e, parent.event, self.context.x) < 0:
+                if parent.left is None:
+                    parent.left = node
+                    break
+                parent = parent.left
+            else:
+                if parent.right is None:
+                    parent.right = node
+                    break
+                parent = parent.right
+
+        node.parent = parent
+        while node.parent is not None and node.parent.priority > node.priority:
+            self.rotate_up(node)
+
+    def remove(self, e):
+        if e is None:
+            return
+
+        node = self.handles.pop(e.segment_id)
+
+        while node.left is not None or node.right is not None:
+            if node.right is None or (node.left is not None and node.left.priority < node.right.priority):
+                self.rotate_up(node.left)
+            else:
+                self.rotate_up(node.right)
+
+        parent = node.parent
+        if parent is None:
+            self.root = None
+        elif parent.left is node:
+            parent.left = None
+        else:
+            parent.right = None
+
+    def swap(self, id_1, id_2):
+        node_1 = self.handles[id_1]
+        node_2 = self.handles[id_2]
+
+        node_1.event, node_2.event = node_2.event, node_1.event
+        self.handles[id_1], self.handles[id_2] = node_2, node_1
+
+    def get_neighbours(self, e):
+        if e is None:
+            return [None, None]
+
+        node = self.handles[e.segment_id]
+        prev = self.predecessor(node)
+        nxt = self.successor(node)
+
+        return [prev.event if prev else None, nxt.event if nxt else None]
+
+    def rotate_up(self, node):
+        parent = node.parent
+        grand = parent.parent
+
+        if parent.left is node:
+            parent.left = node.right
+            if node.right is not None:
+                node.right.parent = parent
+            node.right = parent
+        else:
+            parent.right = node.left
+            if node.left is not None:
+                node.left.parent = parent
+            node.left = parent
+
+        parent.parent = node
+        node.parent = grand
+
+        if grand is None:
+            self.root = node
+        elif grand.left is parent:
+            grand.left = node
+        else:
+            grand.right = node
+
+    @staticmethod
+    def predecessor(node):
+        if node.left is not None:
+            node = node.left
+            while node.right is not None:
+                node = node.right
+            return node
+
+        while node.parent is not None and node.parent.left is node:
+            node = node.parent
+        return node.parent
+
+    @staticmethod
+    def successor(node):
+        if node.right is not None:
+            node = node.right
+            while node.left is not None:
+                node = node.left
+            return node
+
+        while node.parent is not None and node.parent.right is node:
+            node = node.parent
+        return node.parent
@@ -0,0 +1,176 @@
+from fractions import Fraction
+import numpy as np
+
+# Shewchuk's bound on the rounding error of the float orientation determinant:
+# if |det| exceeds it, the sign of the float result is the exact sign
+ORIENT_ERRBOUND = (3 + 16 * 2.0 ** -53) * 2.0 ** -53
+
+# Veltkamp's constant splitting a float into two halves of 26 significant bits
+SPLITTER = 2.0 ** 27 + 1
+
+# coordinates within this range (or zero) keep every product in orient_expansion exact:
+# none overflows and the rounding errors of the products stay above the smallest float
+EXPANSION_MIN, EXPANSION_MAX = 2.0 ** -200, 2.0 ** 400
+
+
+def two_sum(a, b):
+    """
+    Error-free sum: a + b == x + y exactly, x being the rounded sum
+    """
+    x = a + b
+    b_virtual = x - a
+    a_virtual = x - b_virtual
+    return x, (a - a_virtual) + (b - b_virtual)
+
+
+def split(a):
+    """
+    Veltkamp split: a == hi + lo, both halves having at most 26 significant bits
+    """
+    c = SPLITTER * a
+    hi = c - (c - a)
+    return hi, a - hi
+
+
+def two_product(a, b):
+    """
+    Error-free product: a * b == x + y exactly, x being the rounded product
+    """
+    x = a * b
+    a_hi, a_lo = split(a)
+    b_hi, b_lo = split(b)
+    err = x - a_hi * b_hi - a_lo * b_hi - a_hi * b_lo
+    return x, a_lo * b_lo - err
+
+
+def expansion_sign(terms):
+    """
+    Exact sign of a sum of float arrays, summed into a nonoverlapping expansion
+    with Shewchuk's grow-expansion (two_sum only, so it works elementwise on arrays)
+    :return: int8 array of 1 / -1 / 0
+    """
+    expansion = []
+    for term in terms:
+        grown = []
+        for component in expansion:
+            term, error = two_sum(term, component)
+            grown.append(error)
+        grown.append(term)
+        expansion = grown
+
+    # the components grow in magnitude without overlapping, so the largest nonzero one has the sign of the sum
+    result = np.zeros(np.shape(terms[0]), dtype=np.int8)
+    for component in expansion:
+        result = np.where(component != 0, np.sign(component), result).astype(np.int8)
+    return result
+
+
+def orient_expansion(a, b, c):
+    """
+    Exact orientation of arrays of points, computed with error-free transformations:
+    the coordinate differences and their products are split into exact two-term sums
+    and the determinant is summed exactly. Only valid for coordinates passing the
+    EXPANSION_MIN / EXPANSION_MAX check in orient_batch.
+    :return: int8 array of 1 / -1 / 0
+    """
+    acx, acx_tail = two_sum(a[..., 0], -c[..., 0])
+    acy, acy_tail = two_sum(a[..., 1], -c[..., 1])
+    bcx, bcx_tail = two_sum(b[..., 0], -c[..., 0])
+    bcy, bcy_tail = two_sum(b[..., 1], -c[..., 1])
+
+    terms = []
+    for left, right, sign in [((acx, acx_tail), (bcy, bcy_tail), 1), ((acy, acy_tail), (bcx, bcx_tail), -1)]:
+        for u in left:
+            for v in right:
+                terms.extend(sign * part for part in two_product(u, v))
+
+    return expansion_sign(terms)
+
+
+def orient_exact(a, b, c):
+    """
+    Exact sign of the orientation determinant, computed on rationals
+    :return: 1 if c lies to the left of ab, -1 if to the right, 0 if a, b, c are collinear
+    """
+    a_x, a_y = Fraction(float(a[0])), Fraction(float(a[1]))
+    b_x, b_y = Fraction(float(b[0])), Fraction(float(b[1]))
+    c_x, c_y = Fraction(float(c[0])), Fraction(float(c[1]))
+
+    det = (a_x - c_x) * (b_y - c_y) - (a_y - c_y) * (b_x - c_x)
+
+    return (det > 0) - (det < 0)
+
+
+def orient(a, b, c):
+    """
+    Orientation of the point c with respect to the directed line ab.
+    Computed in floats and recomputed exactly only when the float result is
+    too close to zero to trust its sign.
+    :return: 1 if c lies to the left of ab, -1 if to the right, 0 if a, b, c are collinear
+    """
+    c_x, c_y = c
+    det_left = (a[0] - c_x) * (b[1] - c_y)
+    det_right = (a[1] - c_y) * (b[0] - c_x)
+    det = det_left - det_right
+
+    # when the two products differ in sign (or one is zero) the float subtraction keeps the exact sign
+    if det_left > 0:
+        if det_right <= 0:
+            return 1 if det > 0 else 0
+        det_sum = det_left + det_right
+    elif det_left < 0:
+        if det_right >= 0:
+            return -1 if det < 0 else 0
+        det_sum = -det_left - det_right
+    else:
+        return (det > 0) - (det < 0)
+
+    err_bound = ORIENT_ERRBOUND * det_sum
+
+    if det > err_bound:
+        return 1
+    if det < -err_bound:
+        return -1
+
+    return orient_exact(a, b, c)
+
+
+def orient_batch(a, b, c):
+    """
+    Batched orient for arrays of points. Elements whose float sign cannot be trusted
+    are recomputed exactly all at once with orient_expansion, only points outside
+    its range fall back to orient_exact one by one.
+    :param a: points of shape (..., 2)
+    :param b: points of shape (..., 2), broadcastable against a
+    :param c: points of shape (..., 2), broadcastable against a and b
+    :return: int8 array of 1 / -1 / 0 with the broadcast shape
+    """
+    a, b, c = np.broadcast_arrays(np.asarray(a, dtype=float), np.asarray(b, dtype=float), np.asarray(c, dtype=float))
+
+    with np.errstate(over='ignore', invalid='ignore'):
+        det_left = (a[..., 0] - c[..., 0]) * (b[..., 1] - c[..., 1])
+        det_right = (a[..., 1] - c[..., 1]) * (b[..., 0] - c[..., 0])
+        det = det_left - det_right
+
+        err_bound = ORIENT_ERRBOUND * (np.abs(det_left) + np.abs(det_right))
+
+        result = np.array(np.sign(det), dtype=np.int8)
+
+    # written as a negation, so overflowed (nan) determinants are uncertain as well;
+    # when both products are zero (err_bound == 0) the sign 0 is taken as certain, like in orient
+    uncertain = ~(np.abs(det) > err_bound) & (err_bound != 0)
+    if not uncertain.any():
+        return result
+
+    points = np.stack((a[uncertain], b[uncertain], c[uncertain]))
+    magnitude = np.abs(points)
+    in_range = np.all(((magnitude >= EXPANSION_MIN) & (magnitude <= EXPANSION_MAX)) | (points == 0), axis=(0, 2))
+
+    exact = np.empty(len(in_range), dtype=np.int8)
+    exact[in_range] = orient_expansion(*points[:, in_range])
+    for ix in np.nonzero(~in_range)[0]:
+        exact[ix] = orient_exact(*points[:, ix])
+
+    result[uncertain] = exact
+
+    return result
@@ -3,17 +3,19 @@ from numpy import linalg, array
 from random import uniform
 
 class Test(TestCore):
-    def runtest(self, task_no, *func):
+    def runtest(self, task_no, *func, workers=None, timeout=None):
         """
             Checks the correctness of the function
             :param task_no: number of task
             :param func: name of functions to test
+            :param workers: number of processes running the tests at once
+            :param timeout: time limit of a single test in seconds
             :return:
         """
         if task_no == 1:
-            TestCore.test(self, 1, 1, self.task1_func, *func)
+            return TestCore.test(self, 1, 1, self.task1_func, *func, workers=workers, timeout=timeout)
         else:
-            TestCore.test(self, 1, 2, self.task2_func, *func)
+            return TestCore.test(self, 1, 2, self.task2_func, *func, workers=workers, timeout=timeout)
 
     # 10**5 numbers from interval [-1000, 1000]
     # 10**5 numbers from interval [-10**14, 10**14]
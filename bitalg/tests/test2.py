@@ -1,4 +1,4 @@
-from .test_core import TestCore, get_test_path
+from .test_core import TestCore, load_fixture_points
 
 
 def list_equal(a, b):
@@ -17,20 +17,21 @@ def list_equal(a, b):
 
 
 class Test(TestCore):
-    def runtest(self, task_no, func):
+    def runtest(self, task_no, func, workers=None, timeout=None):
         if task_no in [1, 2]:
-            TestCore.test(self, 2, task_no, self.test_func, func, task_no)
+            return TestCore.test(self, 2, task_no, self.test_func, func, task_no, workers=workers, timeout=timeout)
         else:
             raise ValueError('Available task numbers are 1 or 2.')
 
     @staticmethod
     def read_data(task_no, test_no):
-        with open(get_test_path(2, task_no, test_no) + ".in") as f:
-            all_points = [(float(line.split()[0]), float(line.split()[1])) for line in f.readlines()]
-        with open(get_test_path(2, task_no, test_no) + ".out") as f:
-            hull_points = [(float(line.split()[0]), float(line.split()[1])) for line in f.readlines()]
+        all_points = load_fixture_points(2, task_no, test_no, ".in")
+        hull_points = load_fixture_points(2, task_no, test_no, ".out")
         return all_points, hull_points
 
+    def load(self, task_no, test_no):
+        return self.read_data(task_no, test_no)[0]
+
     def test_func(self, test_no, func, task_no):
         test_input, test_answer = self.read_data(task_no, test_no)
         test_output = func(test_input)
@@ -1,30 +1,36 @@
-from .test_core import TestCore, get_test_path
+from .test_core import TestCore, get_test_path, load_fixture_points
 
 class Test(TestCore):
-    def runtest(self, task_no, func):
+    def runtest(self, task_no, func, workers=None, timeout=None):
         """
         Checks the correctness of the function
         :param task_no: number of task
         :param func: name of function to test
+        :param workers: number of processes running the tests at once
+        :param timeout: time limit of a single test in seconds
         :return:
         """
         if task_no == 1:
-            TestCore.test(self, 3, 1, self.task1_func, func)
+            return TestCore.test(self, 3, 1, self.task1_func, func, workers=workers, timeout=timeout)
         elif task_no == 2:
-            TestCore.test(self, 3, 2, self.task2_func, func)
+            return TestCore.test(self, 3, 2, self.task2_func, func, workers=workers, timeout=timeout)
         else:
-            TestCore.test(self, 3, 3, self.task3_func, func)
+            return TestCore.test(self, 3, 3, self.task3_func, func, workers=workers, timeout=timeout)
 
     @staticmethod
     def read_data(task_no, test_no):
         try:
-            with open(get_test_path(3, task_no, test_no) + ".in") as f:
-                Points = [(float(line.split()[0]), float(line.split()[1])) for line in f.readlines()]
-                return Points
+            return load_fixture_points(3, task_no, test_no)
         except FileNotFoundError:
             print(f"ERROR: File not found ({get_test_path(3, task_no, test_no)}.in)")
             return []
 
+    def load(self, task_no, test_no):
+        try:
+            return load_fixture_points(3, task_no, test_no)
+        except FileNotFoundError:
+            return None
+
     # is y-monotone
     def task1_func(self, test_no, func):
         Input = self.read_data(1, test_no)
@@ -1,4 +1,4 @@
-from .test_core import TestCore, get_test_path
+from .test_core import TestCore, get_test_path, load_fixture, load_fixture_points
 
 class Point:
     def __init__(self, x_cord, y_cord, eps):
@@ -19,16 +19,16 @@ class Point:
 
 
 class Test(TestCore):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, memory=False):
+        super().__init__(memory)
 
-    def runtest(self, task_no, func, eps=10**(-12)):
+    def runtest(self, task_no, func, eps=10**(-12), workers=None, timeout=None):
         if task_no == 1:
-            TestCore.test(self, 4, 1, self.task1_fun, func, eps)
+            return TestCore.test(self, 4, 1, self.task1_fun, func, eps, workers=workers, timeout=timeout)
         elif task_no == 2:
-            TestCore.test(self, 4, 2, self.task2_func, func, eps)
+            return TestCore.test(self, 4, 2, self.task2_func, func, eps, workers=workers, timeout=timeout)
         elif task_no == 3:
-            TestCore.test(self, 4, 3, self.task3_fun, func, eps)
+            return TestCore.test(self, 4, 3, self.task3_fun, func, eps, workers=workers, timeout=timeout)
 
     @staticmethod
     def read_data(task_no, test_no):
@@ -38,12 +38,8 @@ class Test(TestCore):
         :param test_no:
         :return:
         """
-        points = []
         try:
-            with open(get_test_path(4, task_no, test_no) + ".in") as file:
-                for point in file:
-                    points.append(list(map(float, point.split(" "))))
-            return points
+            return load_fixture(4, task_no, test_no).tolist()
         except FileNotFoundError:
             print(f"ERROR: File not found ({get_test_path(4, task_no, test_no)}.in)")
             return []
@@ -56,12 +52,12 @@ class Test(TestCore):
         :param test_no:
         :return:
         """
-        lines = []
-        with open(get_test_path(4, task_no, test_no) + ".in") as file:
-            for point in file:
-                x1, y1, x2, y2 = (map(float, point.split(" ")))
-                lines.append(((x1, y1), (x2, y2)))
-        return lines
+        return load_fixture_points(4, task_no, test_no)
+
+    def load(self, task_no, test_no):
+        if task_no in [2, 3]:
+            return self.read_points(task_no, test_no)
+        return None
 
     def task1_fun(self, test_no, func, eps):
         """
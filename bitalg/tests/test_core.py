@@ -1,23 +1,226 @@
 from os import path, listdir
-from time import process_time
+from time import perf_counter, process_time
+from multiprocessing.connection import wait
+import multiprocessing
+import json
+import tracemalloc
+import numpy as np
 from bitalg import __path__ as pkg_path
+from bitalg.dataset import read_fixture
+
+_fixtures = {}
+_fixture_points = {}
 
 
 def get_test_path(lab_no, task_no, test_no):
     return path.join(pkg_path[0], f"tests/test{lab_no}_tests/task{task_no}/test_{lab_no}_{task_no}_{test_no}")
 
 
+def load_fixture(lab_no, task_no, test_no, ext=".in"):
+    """
+    Parses a whole fixture with read_fixture.
+    Fixtures are cached, so repeated runtest calls read every file only once.
+    :return: read-only float array of shape (lines, numbers in a line)
+    """
+    file_name = get_test_path(lab_no, task_no, test_no) + ext
+    if file_name not in _fixtures:
+        data = read_fixture(file_name)
+        data.setflags(write=False)
+        _fixtures[file_name] = data
+    return _fixtures[file_name]
+
+
+def load_fixture_points(lab_no, task_no, test_no, ext=".in"):
+    """
+    Cached fixture as points [(x1, y1), ...], or as segments [((x1, y1), (x2, y2)), ...] for 4 numbers in a line
+    :return: a new list on every call, so the tested function may modify it
+    """
+    file_name = get_test_path(lab_no, task_no, test_no) + ext
+    if file_name not in _fixture_points:
+        data = load_fixture(lab_no, task_no, test_no, ext)
+        if data.shape[1] == 4:
+            _fixture_points[file_name] = [((x1, y1), (x2, y2)) for x1, y1, x2, y2 in data.tolist()]
+        else:
+            _fixture_points[file_name] = list(map(tuple, data.tolist()))
+    return list(_fixture_points[file_name])
+
+
+class TestRecord:
+    def __init__(self, test_no, passed, wall_time, cpu_time, peak_memory=None, input_size=None, error=None):
+        """
+        :param passed: whether the test passed
+        :param wall_time: wall-clock time of the test in seconds
+        :param cpu_time: CPU time of the test in seconds (None if the test did not finish)
+        :param peak_memory: peak memory allocated during the test in bytes (None if not measured)
+        :param input_size: number of points or segments in the input (None if unknown)
+        :param error: why the test did not finish, e.g. a timeout or an exception in a worker
+        """
+        self.test_no = test_no
+        self.passed = passed
+        self.wall_time = wall_time
+        self.cpu_time = cpu_time
+        self.peak_memory = peak_memory
+        self.input_size = input_size
+        self.error = error
+
+    def to_dict(self):
+        return dict(self.__dict__)
+
+
+class TestResult:
+    def __init__(self, lab_no, task_no, expected_count):
+        self.lab_no = lab_no
+        self.task_no = task_no
+        self.expected_count = expected_count
+        self.records = []
+
+    @property
+    def passed(self):
+        return sum(record.passed for record in self.records)
+
+    @property
+    def wall_time(self):
+        return sum(record.wall_time or 0 for record in self.records)
+
+    @property
+    def cpu_time(self):
+        return sum(record.cpu_time or 0 for record in self.records)
+
+    def to_dict(self):
+        return {
+            "lab_no": self.lab_no,
+            "task_no": self.task_no,
+            "passed": self.passed,
+            "expected_count": self.expected_count,
+            "wall_time": self.wall_time,
+            "cpu_time": self.cpu_time,
+            "tests": [record.to_dict() for record in self.records],
+        }
+
+    def to_json(self, file_name=None):
+        """
+        :param file_name: file to save the JSON to
+        :return: the results as a JSON string
+        """
+        result = json.dumps(self.to_dict(), indent=2)
+        if file_name is not None:
+            with open(file_name, "w") as f:
+                f.write(result)
+        return result
+
+    def __repr__(self):
+        return f"TestResult(lab {self.lab_no}, task {self.task_no}: {self.passed}/{self.expected_count} passed, " \
+               f"{self.wall_time:.3f}s)"
+
+
 class TestCore:
-    sum_time = 0
-    def __init__(self):
+    def __init__(self, memory=False):
+        """
+        :param memory: measure the peak memory of every test with tracemalloc,
+                       which slows the tested functions down, so their times grow as well
+        """
         self.tests_in = [[4, 2],  # number of tests in [lab-1 = row][task-1 = column]
                          [11, 11],  # lab 2
                          [10, 10, 10],  # lab 3
                          [3, 3, 3]]  # lab 4
-    def __del__(self):
-        print(f"Time: {self.sum_time:.3f}s")
+        self.memory = memory
+        self.sum_time = 0
+        self.results = []
+
+    def load(self, task_no, test_no):
+        """
+        Loads the fixtures of a test into the cache, called before its time is measured
+        :return: input of the test if it is known in advance, otherwise None
+        """
+        return None
+
+    def measure(self, test_func, test_no, func, *args):
+        """
+        Runs a single test and measures it
+        :return: (result, output and expected output, wall time, CPU time, peak memory)
+        """
+        peak_memory = None
+        if self.memory:
+            tracemalloc.start()
+        try:
+            wall_start, cpu_start = perf_counter(), process_time()
+            result, *output_expected = test_func(test_no, func, *args)
+            cpu_time, wall_time = process_time() - cpu_start, perf_counter() - wall_start
+            if self.memory:
+                peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            if self.memory:
+                tracemalloc.stop()
+
+        return result, output_expected, wall_time, cpu_time, peak_memory
+
+    def measure_in_worker(self, connection, test_func, test_no, func, *args):
+        try:
+            result, output_expected, *measurements = self.measure(test_func, test_no, func, *args)
+            # outputs are only printed, so they are sent as text in case they cannot be pickled
+            connection.send((result, [str(output) for output in output_expected], *measurements))
+        except BaseException as e:
+            connection.send(e.__class__.__name__ + ": " + str(e))
+        finally:
+            connection.close()
+
+    def measure_parallel(self, test_nos, workers, timeout, test_func, func, *args):
+        """
+        Runs every test in its own forked process, at most workers of them at once.
+        Processes still running after timeout seconds are terminated.
+        :return: dictionary {test_no: measure result, or an error message if the test did not finish}
+        """
+        context = multiprocessing.get_context("fork")
+        results = {}
+        pending = list(test_nos)
+        running = {}
+
+        while pending or running:
+            while pending and len(running) < workers:
+                test_no = pending.pop(0)
+                receiver, sender = context.Pipe(duplex=False)
+                process = context.Process(target=self.measure_in_worker, args=(sender, test_func, test_no, func, *args))
+                process.start()
+                sender.close()
+                running[test_no] = (process, receiver, perf_counter())
+
+            wait_time = None
+            if timeout is not None:
+                wait_time = max(0, min(start for _, _, start in running.values()) + timeout - perf_counter())
+            ready = wait([receiver for _, receiver, _ in running.values()], wait_time)
+
+            for test_no, (process, receiver, start) in list(running.items()):
+                if receiver in ready:
+                    try:
+                        results[test_no] = receiver.recv()
+                    except EOFError:
+                        results[test_no] = f"worker exited with code {process.exitcode}"
+                elif timeout is not None and perf_counter() - start >= timeout:
+                    process.terminate()
+                    results[test_no] = f"timeout after {timeout}s"
+                else:
+                    continue
+
+                process.join()
+                receiver.close()
+                del running[test_no]
+
+        return results
+
+    def test(self, lab_no, task_no, test_func, func, *args, workers=None, timeout=None):
+        """
+        Runs all tests of a task and measures each of them
+        :param workers: run the tests in this many processes at once (forked, so not available on Windows,
+                        where passing workers or timeout raises ValueError)
+        :param timeout: limit of a single test in seconds, tests running longer fail;
+                        setting it runs the tests in separate processes even without workers
+        :return: TestResult with a TestRecord for every test
+        """
+        parallel = workers is not None or timeout is not None
+        if parallel and "fork" not in multiprocessing.get_all_start_methods():
+            raise ValueError("workers and timeout need processes started with fork, which this system "
+                             "(e.g. Windows) does not provide; run the tests without them.")
 
-    def test(self, lab_no, task_no, test_func, func, *args):
         print("Lab {}, task {}:".format(lab_no, task_no))
 
         if lab_no == 1:
@@ -25,21 +228,44 @@ class TestCore:
         else:
             limit = len(listdir(path.join(pkg_path[0], f"tests/test{lab_no}_tests/task{task_no}"))) // 2 + 1
 
-        counter = 0
+        test_result = TestResult(lab_no, task_no, self.tests_in[lab_no - 1][task_no - 1])
+
+        if parallel:
+            # fixtures are loaded before forking, so the workers share the cache
+            test_inputs = {test_no: self.load(task_no, test_no) for test_no in range(1, limit)}
+            measured = self.measure_parallel(range(1, limit), workers or 1, timeout, test_func, func, *args)
+
         for test_no in range(1, limit):
             print(f"\tTest {test_no}:", end=" ")
 
-            timer_start = process_time()
-            result, *output_expected = test_func(test_no, func, *args)
-            timer_stop = process_time()
-            self.sum_time += timer_stop - timer_start
+            if parallel:
+                test_input, result = test_inputs[test_no], measured[test_no]
+            else:
+                test_input = self.load(task_no, test_no)
+                result = self.measure(test_func, test_no, func, *args)
+
+            input_size = None if test_input is None else len(test_input)
+
+            if isinstance(result, str):
+                test_result.records.append(TestRecord(test_no, False, timeout if result.startswith("timeout") else None,
+                                                      None, None, input_size, result))
+                print("ERROR")
+                print(f"\t\t{result}")
+                continue
+
+            result, output_expected, wall_time, cpu_time, peak_memory = result
+            self.sum_time += cpu_time
+            test_result.records.append(TestRecord(test_no, result == 1, wall_time, cpu_time, peak_memory, input_size))
 
             if result == 1:
                 print("Passed")
-                counter += 1
             else:
                 print("WRONG ANSWER")
                 print(f"\t\tOutput:   {output_expected[0]}")
                 print(f"\t\tExpected: {output_expected[1]}")
 
-        print(f"Result: {counter}/{self.tests_in[lab_no - 1][task_no - 1]}")
+        print(f"Result: {test_result.passed}/{test_result.expected_count}")
+        print(f"Time: {test_result.cpu_time:.3f}s")
+
+        self.results.append(test_result)
+        return test_result
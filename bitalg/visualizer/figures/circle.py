@@ -1,6 +1,7 @@
 from .figure import Figure
 import numpy as np
 from matplotlib.patches import Circle as Circl
+from matplotlib.collections import PatchCollection
 
 
 class Circle(Figure):
@@ -9,8 +10,11 @@ class Circle(Figure):
         super().__init__(data, options)
 
     def draw(self, ax):
-        artist = []
-        for circle in self.data:
-            c = Circl(circle[:2], radius=circle[2], **self.options)
-            artist.append(ax.add_patch(c))
+        if len(self.data) == 0:
+            return []
+        # the patches only carry the options (colors, fill, ...), all of them are drawn as one collection
+        circles = [Circl(circle[:2], radius=circle[2], **self.options) for circle in self.data]
+        collection = PatchCollection(circles, match_original=True, zorder=circles[0].get_zorder(),
+                                     label=circles[0].get_label())
+        artist = [ax.add_collection(collection)]
         return artist
@@ -0,0 +1,66 @@
+from .figure import Figure
+from matplotlib.collections import LineCollection
+import numpy as np
+
+
+class Layer(Figure):
+    """
+    Figure which grows: items appended to it are stored in one array, doubled when full,
+    and drawn as a single artist whose data is updated in place.
+    Subclasses define draw and show_first(artist, count), which updates the artist to show only the first count items.
+    """
+    item_shape = None
+
+    def __init__(self, options):
+        self.buffer = np.empty((16, *self.item_shape))
+        self.count = 0
+        super().__init__(self.buffer[:0], options)
+
+    def append(self, data):
+        data = np.array(data, dtype=float).reshape(-1, *self.item_shape)
+
+        if self.count + len(data) > len(self.buffer):
+            buffer = np.empty((max(2 * len(self.buffer), self.count + len(data)), *self.item_shape))
+            buffer[:self.count] = self.buffer[:self.count]
+            self.buffer = buffer
+
+        self.buffer[self.count:self.count + len(data)] = data
+        self.count += len(data)
+        self.data = self.buffer[:self.count]
+
+
+class PointLayer(Layer):
+    item_shape = (2,)
+
+    def draw(self, ax):
+        artist = [ax.scatter(self.data[:, 0], self.data[:, 1], **self.options)]
+        return artist
+
+    def show_first(self, artist, count):
+        artist[0].set_offsets(self.data[:count])
+
+
+class LineSegmentLayer(Layer):
+    item_shape = (2, 2)
+
+    def draw(self, ax):
+        line_collection = LineCollection(self.data, **self.options)
+        artist = [ax.add_collection(line_collection)]
+        return artist
+
+    def show_first(self, artist, count):
+        artist[0].set_segments(self.data[:count])
+
+
+class LayerStep:
+    """
+    Operation appending items to a layer: in animations the layer shows count items from this frame on
+    """
+    def __init__(self, layer, count):
+        self.layer = layer
+        self.count = count
+        self.to_be_removed = False
+
+    def draw(self, ax):
+        # the items are drawn by the layer itself
+        return []
@@ -1,5 +1,94 @@
 from .figure import Figure
+import warnings
 import numpy as np
+from matplotlib.collections import LineCollection
+
+# Line2D options (accepted by ax.axline) which a LineCollection names differently
+LINE2D_OPTIONS = {
+    'c': 'color',
+    'solid_capstyle': 'capstyle',
+    'dash_capstyle': 'capstyle',
+    'solid_joinstyle': 'joinstyle',
+    'dash_joinstyle': 'joinstyle'
+}
+
+# Line2D options with no LineCollection counterpart; on a line through the whole view they are meaningless
+MARKER_OPTIONS = {
+    'marker', 'markersize', 'ms', 'markeredgecolor', 'mec', 'markeredgewidth', 'mew',
+    'markerfacecolor', 'mfc', 'markerfacecoloralt', 'mfcalt', 'markevery', 'fillstyle', 'drawstyle', 'ds'
+}
+
+
+class ClippedLineCollection(LineCollection):
+    """
+    Lines (or half-lines) through the pairs of points lines[i] = (xy1, xy2), drawn as one LineCollection.
+    Before drawing, all of them are clipped at once to the current view limits, so they always reach its edges;
+    the clipping is only recomputed when the view limits change.
+    """
+    def __init__(self, lines, half=False, **kwargs):
+        """
+        :param lines: array of shape (n, 2, 2)
+        :param half: draw half-lines starting at xy1 and going through xy2 instead of lines
+        """
+        super().__init__([], **kwargs)
+        self.starts = lines[:, 0]
+        self.directions = lines[:, 1] - lines[:, 0]
+        self.half = half
+        self.view = None
+
+        if np.any(np.all(self.directions == 0, axis=1)):
+            raise ValueError('Cannot draw a line through two identical points.')
+
+    def clip(self, view):
+        """
+        Liang-Barsky clipping of every line p + t * d to the rectangle view = ((x_lo, y_lo), (x_hi, y_hi))
+        :return: segments of shape (k, 2, 2) of the lines which cross the rectangle
+        """
+        lo, hi = np.minimum(view[0], view[1]), np.maximum(view[0], view[1])
+        p, d = self.starts, self.directions
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t_lo, t_hi = (lo - p) / d, (hi - p) / d
+        enter, leave = np.minimum(t_lo, t_hi), np.maximum(t_lo, t_hi)
+
+        # a line parallel to an axis either runs within the rectangle's range of that coordinate or misses it
+        parallel = d == 0
+        inside = (lo <= p) & (p <= hi)
+        enter[parallel] = np.where(inside[parallel], -np.inf, np.inf)
+        leave[parallel] = np.where(inside[parallel], np.inf, -np.inf)
+
+        enter, leave = enter.max(axis=1), leave.min(axis=1)
+        if self.half:
+            enter = np.maximum(enter, 0)
+
+        crossing = enter <= leave
+        p, d = p[crossing], d[crossing]
+        return np.stack((p + enter[crossing, None] * d, p + leave[crossing, None] * d), axis=1)
+
+    def draw(self, renderer):
+        view = tuple(self.axes.viewLim.get_points().ravel())
+        if view != self.view:
+            self.view = view
+            self.set_segments(self.clip(self.axes.viewLim.get_points()))
+        super().draw(renderer)
+
+
+def add_lines(ax, lines, half, options):
+    """
+    Adds a ClippedLineCollection to ax, in front of patches like a Line2D,
+    and includes the points defining the lines in the data limits like ax.axline.
+    Line2D options are renamed for the collection, marker options are dropped with a warning.
+    """
+    dropped = sorted(MARKER_OPTIONS.intersection(options))
+    if dropped:
+        warnings.warn(f"Lines and half-lines are drawn without markers, ignoring: {', '.join(dropped)}")
+
+    options = {LINE2D_OPTIONS.get(key, key): value for key, value in options.items() if key not in MARKER_OPTIONS}
+    options = {'zorder': 2, **options}
+    collection = ClippedLineCollection(lines, half, **options)
+    ax.add_collection(collection, autolim=False)
+    ax.update_datalim(lines.reshape(-1, 2))
+    return collection
 
 
 class Line(Figure):
@@ -8,7 +97,5 @@ class Line(Figure):
         super().__init__(data, options)
 
     def draw(self, ax):
-        artist = []
-        for line in self.data:
-            artist.append(ax.axline(line[0], line[1], **self.options))
+        artist = [add_lines(ax, self.data, False, self.options)]
         return artist
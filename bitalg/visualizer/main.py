@@ -4,6 +4,7 @@ from .figures.circle import Circle
 from .figures.polygon import Polygon
 from .figures.line import Line
 from .figures.half_line import HalfLine
+from .figures.layer import PointLayer, LineSegmentLayer, LayerStep
 from .plot.plot import Plot
 
 
@@ -51,10 +52,29 @@ class Visualizer:
         self.data.append(semi_line)
         return semi_line
 
+    def add_point_layer(self, **kwargs):
+        point_layer = PointLayer(kwargs)
+        self.data.append(point_layer)
+        return point_layer
+
+    def add_line_segment_layer(self, **kwargs):
+        line_segment_layer = LineSegmentLayer(kwargs)
+        self.data.append(line_segment_layer)
+        return line_segment_layer
+
+    def add_to_layer(self, layer, data):
+        # all items of a layer are drawn by a single artist, however many times it is extended
+        layer.append(data)
+        self.data.append(LayerStep(layer, layer.count))
+
     def remove_figure(self, figure):
         figure.to_be_removed = True
         self.data.append(figure)
 
+    def mark_keyframe(self):
+        # the current state is always rendered in animations, even with max_frames
+        self.plot_data.setdefault('keyframes', []).append(len(self.data))
+
     def clear(self):
         self.data = []
         self.plot_data = {}
@@ -65,9 +85,9 @@ class Visualizer:
     def save(self, filename='plot'):
         Plot.save(self.plot_data, self.data, filename)
 
-    def show_gif(self, interval=256):
-        gif = Plot.show_gif(self.plot_data, self.data, interval)
+    def show_gif(self, interval=256, max_fps=None, colors=None, max_frames=None):
+        gif = Plot.show_gif(self.plot_data, self.data, interval, max_fps, colors, max_frames)
         return gif
 
-    def save_gif(self, filename='animation', interval=256):
-        Plot.save_gif(self.plot_data, self.data, interval, filename)
+    def save_gif(self, filename='animation', interval=256, max_fps=None, colors=None, max_frames=None):
+        Plot.save_gif(self.plot_data, self.data, interval, filename, max_fps, colors, max_frames)
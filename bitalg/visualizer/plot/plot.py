@@ -1,7 +1,59 @@
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 from IPython.display import Image
+from PIL import Image as PILImage
+from io import BytesIO
+from bisect import bisect_left
+import math
 import os
+from ..figures.layer import Layer, LayerStep
+
+
+class GifWriter(animation.PillowWriter):
+    def __init__(self, fps=5, frame_count=None, max_fps=None, colors=None, **kwargs):
+        """
+        PillowWriter which can also write to a file object (e.g. BytesIO)
+        :param frame_count: number of frames of the animation, needed for max_fps
+        :param max_fps: keep only every k-th frame (and the last one) so the frame rate is at most max_fps,
+                        the kept frames are shown longer, so the animation takes the same time
+        :param colors: quantize every frame to a palette of at most this many colors
+        """
+        super().__init__(fps=fps, **kwargs)
+        self.step = 1 if max_fps is None or fps <= max_fps else math.ceil(fps / max_fps)
+        self.frame_count = frame_count
+        self.colors = colors
+
+    def setup(self, fig, outfile, dpi=None):
+        if isinstance(outfile, (str, os.PathLike)):
+            super().setup(fig, outfile, dpi=dpi)
+        else:
+            self.outfile = outfile
+            self.fig = fig
+            self.dpi = dpi or fig.dpi
+            self._frames = []
+        self._frame_no = 0
+        self._kept = []
+
+    def grab_frame(self, **savefig_kwargs):
+        frame_no = self._frame_no
+        self._frame_no += 1
+
+        if frame_no % self.step != 0 and frame_no != self.frame_count - 1:
+            return
+
+        super().grab_frame(**savefig_kwargs)
+        self._kept.append(frame_no)
+
+    def finish(self):
+        frames = self._frames
+        if self.colors is not None:
+            frames = [frame.quantize(colors=self.colors, method=PILImage.Quantize.FASTOCTREE) for frame in frames]
+
+        interval = 1000 / self.fps
+        ends = self._kept[1:] + [self._kept[-1] + 1]
+        durations = [int(interval * (end - start)) for start, end in zip(self._kept, ends)]
+
+        frames[0].save(self.outfile, format='GIF', save_all=True, append_images=frames[1:], duration=durations, loop=0)
 
 
 class Plot:
@@ -28,35 +80,110 @@ class Plot:
         return fig, ax
 
     @staticmethod
-    def __build_gif(plot_data, data, interval):
+    def __select_frames(plot_data, data, max_frames):
+        """
+        Frame k of an animation shows the plot after the first k operations (figures added or removed).
+        With max_frames only that many frames spread evenly over the animation are kept,
+        and the operations between them are coalesced; the last frame and the frames
+        marked with Visualizer.mark_keyframe are always kept, even above the budget.
+        :return: sorted indices of the frames to render
+        """
+        last = len(data)
+        if max_frames is None or max_frames > last:
+            return list(range(last + 1))
+
+        selected = set(plot_data.get('keyframes', []))
+        selected.add(last)
+        budget = max_frames - len(selected)
+        if budget > 0:
+            selected.update(round(i * last / budget) for i in range(budget))
+
+        return sorted(selected)
+
+    @staticmethod
+    def __build_gif(plot_data, data, interval, frames=None):
+        """
+        :param frames: sorted indices of the frames to render (see __select_frames), all of them by default
+        """
+        if frames is None:
+            frames = list(range(len(data) + 1))
+
         fig, ax = plt.subplots()
-        artists = []
-        frames = [ax.set_xlabel('x'), ax.set_ylabel('y')]
-        artists.append(frames[:])
+        ax.set_xlabel('x')
+        ax.set_ylabel('y')
 
         if 'title' in plot_data:
             ax.set_title(plot_data['title'])
         if 'grid' in plot_data:
             ax.grid()
 
-        for figure in data:
-            if figure.to_be_removed and figure.artist:
-                first = frames.index(figure.artist[0])
-                last = frames.index(figure.artist[-1])
-                figure.artist = None
-                frames = frames[:first] + frames[last+1:]
+        # the operation removing each added figure, the same figure object appears in data once more when removed
+        removed_at = {}
+        added = {}
+        for i, figure in enumerate(data):
+            if figure.to_be_removed and id(figure) in added:
+                removed_at[added.pop(id(figure))] = i
             else:
+                added[id(figure)] = i
+
+        # every figure is drawn once, hidden; deltas[k] holds the artists shown and hidden by the k-th operation
+        # and the new item counts of the layers it changed
+        deltas = []
+        removals = set(removed_at.values())
+        for i, figure in enumerate(data):
+            if i in removals:
+                deltas.append(([], figure.artist, []))
+                figure.artist = None
+                continue
+            if isinstance(figure, LayerStep):
+                layer = figure.layer
+                deltas.append(([], [], [(layer, layer.artist, figure.count)] if layer.artist else []))
+                continue
+
+            # a figure removed before the next rendered frame is never seen, so it is not drawn at all
+            first_frame = bisect_left(frames, i + 1)
+            if first_frame < len(frames) and frames[first_frame] <= removed_at.get(i, len(data)):
                 artist = figure.draw(ax)
-                figure.artist = artist
-                frames.extend(artist)
-            artists.append(frames[:])
-                
+                for a in artist:
+                    a.set_visible(False)
+            else:
+                artist = []
+            figure.artist = artist
+            deltas.append((artist, [], [(figure, artist, 0)] if artist and isinstance(figure, Layer) else []))
+
         if 'axis_equal' in plot_data:
             ax.axis('equal')
         else:
             ax.autoscale()
-            
-        return animation.ArtistAnimation(fig=fig, artists=artists, interval=interval, blit=True)
+
+        current = [0]
+
+        def update(frame):
+            # frames are rendered in order, so only the last operation is applied;
+            # going back (when the animation repeats) replays it from the empty plot
+            if frame < current[0]:
+                for shown, _, _ in deltas:
+                    for a in shown:
+                        a.set_visible(False)
+                current[0] = 0
+
+            # only the last count of a layer matters when several steps are coalesced into one frame
+            layer_counts = {}
+            for shown, hidden, counts in deltas[current[0]:frame]:
+                for a in shown:
+                    a.set_visible(True)
+                for a in hidden:
+                    a.set_visible(False)
+                for layer, artist, count in counts:
+                    layer_counts[id(artist)] = (layer, artist, count)
+            for layer, artist, count in layer_counts.values():
+                layer.show_first(artist, count)
+            current[0] = frame
+
+            return []
+
+        return animation.FuncAnimation(fig=fig, func=update, frames=frames, init_func=lambda: update(frames[0]),
+                                       interval=interval)
 
     @staticmethod
     def show(plot_data, data):
@@ -70,16 +197,19 @@ class Plot:
         plt.close()
 
     @staticmethod
-    def show_gif(plot_data, data, interval):
-        Plot.save_gif(plot_data, data, interval,
-                      f'{__file__}.__tmp_animation_holder__')
+    def __write_gif(plot_data, data, interval, outfile, max_fps, colors, max_frames):
+        frames = Plot.__select_frames(plot_data, data, max_frames)
+        anim = Plot.__build_gif(plot_data, data, interval, frames)
+        writer = GifWriter(fps=1000 / interval, frame_count=len(frames), max_fps=max_fps, colors=colors)
+        anim.save(outfile, writer=writer)
         plt.close()
-        gif = Image(f'{__file__}.__tmp_animation_holder__.gif')
-        os.remove(f'{__file__}.__tmp_animation_holder__.gif')
-        return gif
 
     @staticmethod
-    def save_gif(plot_data, data, interval, filename):
-        anim = Plot.__build_gif(plot_data, data, interval)
-        anim.save(filename=f'{filename}.gif', writer='pillow')
-        plt.close()
+    def show_gif(plot_data, data, interval, max_fps=None, colors=None, max_frames=None):
+        buffer = BytesIO()
+        Plot.__write_gif(plot_data, data, interval, buffer, max_fps, colors, max_frames)
+        return Image(data=buffer.getvalue(), format='gif')
+
+    @staticmethod
+    def save_gif(plot_data, data, interval, filename, max_fps=None, colors=None, max_frames=None):
+        Plot.__write_gif(plot_data, data, interval, f'{filename}.gif', max_fps, colors, max_frames)